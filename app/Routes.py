@@ -1,32 +1,45 @@
 import os
 import random
 import tempfile
-from flask import Flask, render_template, request, abort, url_for
-import requests
+from flask import Flask, Response, render_template, request, abort, url_for
 from util.Utils import Utils
+from util.FileWatcher import FileWatcher
 from services.ingestor_generator.QuoteEngine import Ingestor
+from services.ingestor_generator.base.QuoteStore import QuoteStore
+from services.ingestor_generator.base.QuoteSnapshot import QuoteSnapshot
 from services.meme_generator.models.MemeEngine import ImageCaptioner
 
 class MemeApp:
     """Provide a Flask application for generating memes.
 
     This class initializes a Flask application, sets up routing, and loads the necessary resources
-    for meme generation, such as quotes and images.
+    for meme generation, such as quotes and images. If enabled in the configuration, a background
+    watcher reloads quotes and images when their files change.
     """
 
+    quote_extensions = ('.csv', '.docx', '.pdf', '.txt')
+    image_extensions = ('.jpg',)
+    # Memes are rendered at these widths, up to the width of their image, and served as a
+    # responsive image, displayed display_width CSS pixels wide on large screens
+    srcset_widths = (320, 640, 1280)
+    display_width = 500
+
     def __init__(self):
         """Initialize the Flask app, set up routes, and load quotes and images.
 
-        Attempts to set up the Flask application, specifying the static folder and initializing
+        Attempts to set up the Flask application, specifying the configured static folder and initializing
         meme generation components. If an error occurs during initialization, it will be printed
         to the console.
         """
         try:
-            self.app = Flask(__name__)
-            # Get the path to the 'tmp' directory within the calling script's directory
-            static_folder = Utils.get_calling_child_script_directory('static')
+            # Memes are written to the configured static folder, from which Flask serves them
+            static_folder = Utils.retrieve_file_dir('static')
+            self.app = Flask(__name__, static_folder=static_folder)
             self.meme = ImageCaptioner(static_folder)
+            # Keep the generated memes within the configured quotas in the background
+            self.meme.store.start()
             self.quotes, self.imgs = self.setup()
+            self.watcher = self.setup_watcher()
             self.setup_routes()
         except Exception as e:
             print(f"Error during initialization: {e}")
@@ -34,55 +47,189 @@ class MemeApp:
     def setup(self):
         """Retrieve and return quotes and images for the meme generator.
 
-        Collects quote files and image paths from designated directories and parses the quotes using
-        the Ingestor class. If an error occurs during setup, it prints an error message and returns
-        empty lists.
+        Resolves all configured resource paths once, so requests do not search for them, then
+        collects quote files and image paths from designated directories and parses the quotes in
+        parallel using the Ingestor class. Files that cannot be ingested are reported and skipped.
+        If an error occurs during setup, it prints an error message and returns empty lists.
 
         Returns:
-            tuple: A tuple containing lists of quotes and image file paths.
+            tuple: A tuple containing a QuoteStore of quotes and a list of image file paths.
         """
         try:
-            quotes_dir = Utils.retrieve_file_dir('quotes')
-            quote_files = Utils.retrieve_file_paths(quotes_dir, ('.csv', '.docx', '.pdf', '.txt'))
+            Utils.preload_resources()
+            self.quotes_dir = Utils.retrieve_file_dir('quotes')
+            self.images_dir = Utils.retrieve_file_dir('images')
+            self.cache_dir = Utils.retrieve_file_dir('cache')
+            self.snapshot_path = Utils.retrieve_file_path('cache', 'quotes.snapshot')
+            Ingestor.enable_cache(self.cache_dir)
+            return self.load_quotes(), self.load_images()
+        except Exception as e:
+            print(f"Error during setup: {e}")
+            return QuoteStore(), []
 
-            quotes = []
-            for file in quote_files:
-                quotes.extend(Ingestor.parse(file))
+    def load_quotes(self, workers=None):
+        """Load the quotes into a new QuoteStore.
 
-            images_path = Utils.retrieve_file_dir('images')
-            imgs = Utils.retrieve_file_paths(images_path, ('.jpg',))
+        If a quote snapshot was compiled with `cli.py compile` from the current quote files, it is
+        memory-mapped together with its index, so all server processes share one copy of the corpus
+        and nothing is parsed or indexed. A snapshot that is out of date because quote files were
+        added, removed or modified since it was compiled is ignored. Otherwise the quote files are
+        ingested; unchanged files are loaded from the quote cache, so only new or modified files
+        are parsed. Only the merged quotes are kept in memory, a reload reads the unchanged files
+        from the quote cache again.
 
-            return quotes, imgs
-        except Exception as e:
-            print(f"Error during setup: {e}")
-            return [], []
+        Args:
+            workers (int, optional): The number of processes parsing the files, see
+                Ingestor.parse_many.
+
+        Returns:
+            QuoteStore: The deduplicated quotes.
+        """
+        quote_files = sorted(Utils.retrieve_file_paths(self.quotes_dir, self.quote_extensions))
+        if self.snapshot_path and os.path.isfile(self.snapshot_path):
+            if QuoteSnapshot.is_current(self.snapshot_path, quote_files):
+                return QuoteSnapshot.open(self.snapshot_path)
+            print(f"Quote snapshot {self.snapshot_path} is out of date, ingesting the quote files.")
+        store, report = Ingestor.load_store(quote_files, workers=workers)
+        for file, error in report.errors.items():
+            print(f"Failed to ingest {file}: {error}")
+        return store
+
+    def load_images(self):
+        """Return the paths of all valid library images, sorted.
+
+        The images are verified once here, so rendering a meme on them does not read them again.
+        They are sorted because directory listing order differs between file systems and after
+        files change, and seeded memes pick their image by position in this list.
+        """
+        return Utils.validate_images(sorted(Utils.retrieve_file_paths(self.images_dir, self.image_extensions)))
+
+    def setup_watcher(self):
+        """Start the background watcher of the quote and image directories, if enabled.
+
+        Returns:
+            FileWatcher: The running watcher, or None if it is disabled in the configuration.
+        """
+        settings = Utils.retrieve_config().watcher
+        if not settings.get('enabled', False):
+            return None
+        watcher = FileWatcher(
+            [
+                (self.quotes_dir, self.quote_extensions),
+                (self.images_dir, self.image_extensions),
+                (self.cache_dir, ('.snapshot',)),
+            ],
+            self.reload,
+            settings.get('interval', 5.0),
+        )
+        watcher.start()
+        return watcher
+
+    def reload(self, changed_paths):
+        """Reload the quotes or images affected by changed files.
+
+        The new QuoteStore or image list is built completely before it replaces the current one,
+        so requests in flight keep using the previous content and are never blocked. Only the
+        changed quote files are parsed, in this thread: starting a process pool would fork the
+        multi-threaded server.
+
+        Args:
+            changed_paths (set): The paths of the added, changed or removed files.
+        """
+        directories = {os.path.dirname(path) for path in changed_paths}
+        if self.quotes_dir in directories or self.snapshot_path in changed_paths:
+            self.quotes = self.load_quotes(workers=1)
+        if self.images_dir in directories:
+            self.imgs = self.load_images()
 
     def setup_routes(self):
         """Define and register the web routes for the Flask application.
 
-        This method sets up two main routes: one for generating random memes and another for
-        creating custom memes based on user inputs. Both routes handle possible exceptions by
-        aborting the request with appropriate error messages.
+        This method sets up the main routes: one for generating random memes, one returning a
+        random meme image directly, and another for creating custom memes based on user inputs.
+        All routes handle possible exceptions by aborting the request with appropriate error
+        messages.
         """
+        def choose_meme(rng=random):
+            """Pick a random image and quote for the random meme routes.
+
+            The quote can be narrowed down with the optional query parameters 'author' (the
+            author name) and 'q' (words that must all occur in the quote). If no quotes or
+            images are available, or no quote matches, a 404 error is returned.
+
+            Args:
+                rng (random.Random): The random generator that picks the image and quote.
+
+            Returns:
+                tuple: The image path and the QuoteModel of the meme.
+            """
+            author = request.args.get('author', '').strip()
+            text = request.args.get('q', '').strip()
+            # Take the current content once, as the watcher may swap it at any time
+            quotes, imgs = self.quotes, self.imgs
+            if not quotes or not imgs:
+                abort(404, description="No quotes or images found.")
+            if author or text:
+                quote = quotes.random_match(text, author, rng)
+                if quote is None:
+                    abort(404, description="No quotes match the query.")
+            else:
+                quote = quotes.random_quote(rng)
+            return rng.choice(imgs), quote
+
+        def render_meme(img_path, body, author, cache_image=True):
+            """Create a meme at the srcset widths and render the page showing it.
+
+            The meme is drawn once and scaled down to each width, and the browser picks
+            the width that matches the display size and pixel density. Images that are only
+            used once, such as uploads, are not kept in the image cache.
+            """
+            paths = self.meme.make_meme_set(img_path, body, author, self.srcset_widths,
+                                            cache_image=cache_image)
+            if not paths:
+                raise ValueError("The meme could not be created.")
+            urls = {width: url_for('static', filename=os.path.relpath(path, self.app.static_folder))
+                    for width, path in paths.items()}
+            # Browsers without srcset support get the smallest width covering the display width
+            src_width = min((width for width in urls if width >= self.display_width), default=max(urls))
+            srcset = ', '.join(f"{urls[width]} {width}w" for width in sorted(urls))
+            return render_template('meme.html', path=urls[src_width], srcset=srcset,
+                                   width=self.display_width)
+
         @self.app.route('/')
         def meme_rand():
             """Generate a random meme using a randomly selected image and quote, and render it.
 
-            If no quotes or images are available, a 404 error is returned. Any other error during
+            Accepts the 'author' and 'q' query parameters of choose_meme. If no quotes or images
+            are available, or no quote matches, a 404 error is returned. Any other error during
             meme generation results in a 500 error.
             """
+            img, quote = choose_meme()
             try:
-                if not self.quotes or not self.imgs:
-                    abort(404, description="No quotes or images found.")
-                
-                img = random.choice(self.imgs)
-                quote = random.choice(self.quotes)
-                path = self.meme.make_meme(img, quote.body, quote.author)
-                relative_path = os.path.relpath(path, self.app.static_folder)
-                return render_template('meme.html', path=url_for('static', filename=relative_path))
+                return render_meme(img, quote.body, quote.author)
             except Exception as e:
                 abort(500, description=f"Error generating random meme: {e}")
 
+        @self.app.route('/meme.jpg')
+        def meme_image():
+            """Return a random meme as a JPEG image, without writing it to disk.
+
+            Accepts the 'author' and 'q' query parameters of choose_meme. With the integer query
+            parameter 'seed', the image, quote and text position are deterministic, so the same
+            URL always returns the same meme and repeated requests are served from the render
+            cache. If no quotes or images are available, or no quote matches, a 404 error is
+            returned. If the meme cannot be rendered, a 500 error is returned.
+            """
+            seed = request.args.get('seed', type=int)
+            img, quote = choose_meme(random if seed is None else random.Random(seed))
+            data = self.meme.render_to_bytes(img, quote.body, quote.author, image_format='JPEG', seed=seed)
+            if not data:
+                abort(500, description="Error generating random meme.")
+            if seed is None:
+                # Every request renders a new meme, so the response must not be cached
+                return Response(data, mimetype='image/jpeg', headers={'Cache-Control': 'no-store'})
+            return Response(data, mimetype='image/jpeg')
+
         @self.app.route('/create', methods=['GET'])
         def meme_form():
             """Render the form for users to create custom memes.
@@ -108,6 +255,9 @@ class MemeApp:
             author = request.form['author']
             if not image_url or not body or not author:
                 abort(400, description="Image URL, body, and author are required.")
+            # requests is only needed by this route, so it is imported on first use
+            import requests
+
             tmp_file_path = os.path.join(tempfile.gettempdir(), next(tempfile._get_candidate_names()) + '.jpg')
             try:
                 response = requests.get(image_url)
@@ -115,9 +265,7 @@ class MemeApp:
                     abort(400, description="Could not retrieve image from URL.")
                 with open(tmp_file_path, 'wb') as tmp_file:
                     tmp_file.write(response.content)
-                path = self.meme.make_meme(tmp_file_path, body, author)
-                relative_path = os.path.relpath(path, self.app.static_folder)
-                return render_template('meme.html', path=url_for('static', filename=relative_path))
+                return render_meme(tmp_file_path, body, author, cache_image=False)
             except requests.RequestException as re:
                 abort(400, description=f"Request error: {re}")
             except Exception as e:
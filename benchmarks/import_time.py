@@ -0,0 +1,69 @@
+"""
+This module benchmarks the import time of the application entry points.
+
+Each module is imported in a fresh interpreter started with `python -X importtime`,
+and the report lists the cumulative import time of the module together with its
+slowest dependencies. Heavy optional libraries (pandas, pypdf, requests, ...)
+should not show up unless they are actually needed.
+
+Usage:
+    python -m benchmarks.import_time [module ...] [--runs N] [--top N]
+
+Functions:
+    measure(module): Import a module in a fresh interpreter and collect the timings.
+    main(): Print the import time report for the requested modules.
+"""
+
+import subprocess
+import sys
+from argparse import ArgumentParser
+from statistics import median
+from typing import Dict
+
+DEFAULT_MODULES = ['cli', 'app.Routes']
+WATCHED_LIBRARIES = ['pandas', 'docx', 'requests', 'pypdf', 'lxml', 'numpy']
+
+
+def measure(module: str) -> Dict[str, int]:
+    """
+    Import a module in a fresh interpreter and collect the import timings.
+
+    Args:
+        module (str): The dotted name of the module to import.
+
+    Returns:
+        dict: The cumulative import time in microseconds of every imported module, by name.
+    """
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            stderr=subprocess.PIPE, encoding='utf-8', check=True)
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        timings[name.strip()] = int(cumulative)
+    return timings
+
+
+def main():
+    """Print the import time report for the requested modules."""
+    parser = ArgumentParser(description="Import time benchmark")
+    parser.add_argument('modules', nargs='*', default=DEFAULT_MODULES, help='Modules to import')
+    parser.add_argument('--runs', type=int, default=5, help='Number of fresh interpreters per module')
+    parser.add_argument('--top', type=int, default=10, help='Number of slowest imports to list')
+    args = parser.parse_args()
+
+    for module in args.modules:
+        runs = [measure(module) for _ in range(args.runs)]
+        total = median(run[module] for run in runs)
+        print(f"{module}: {total / 1000:.1f} ms (median of {args.runs} runs)")
+
+        last = runs[-1]
+        loaded = [library for library in WATCHED_LIBRARIES if library in last]
+        print(f"  heavy libraries loaded: {', '.join(loaded) or 'none'}")
+        for name, cumulative in sorted(last.items(), key=lambda item: item[1], reverse=True)[1:args.top + 1]:
+            print(f"  {cumulative / 1000:8.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
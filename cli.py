@@ -5,10 +5,13 @@ to create a meme. If no image path or quote is provided, random selections are m
 
 Usage:
     python main_script.py --path <path_to_image> --body <quote_body> --author <quote_author>
+    python main_script.py compile [--out <snapshot_path>] [--workers <n>]
+    python main_script.py batch (--jobs <jobs.csv> | --count <n>) [--workers <n>] [--out <dir>] [--sizing fit]
 """
 
 from argparse import ArgumentParser
-from services.meme_generator.MemeGenerator import generate_meme
+from services.meme_generator.MemeGenerator import (compile_quotes, generate_meme, generate_memes,
+                                                   random_jobs, read_jobs)
 
 def main():
     """
@@ -20,14 +23,61 @@ def main():
         --author: Quote author to add to the image (optional).
     
     If no arguments are provided, random image and quote will be used.
+
+    Subcommands:
+        compile: Ingest all quote files into the binary quote snapshot used by the web app.
+        batch: Render many memes on a pool of worker processes.
     """
     parser = ArgumentParser(description="Meme Generator CLI")
     parser.add_argument('--path', type=str, help='Path to an image file', default=None)
     parser.add_argument('--body', type=str, help='Quote body to add to the image', default=None)
     parser.add_argument('--author', type=str, help='Quote author to add to the image', default=None)
-    
+
+    subparsers = parser.add_subparsers(dest='command')
+    compile_parser = subparsers.add_parser('compile', help='Compile all quote files into a binary snapshot')
+    compile_parser.add_argument('--out', type=str, help='Path of the snapshot file', default=None)
+    compile_parser.add_argument('--workers', type=int, help='Number of worker processes', default=None)
+
+    batch_parser = subparsers.add_parser('batch', help='Render many memes in parallel')
+    jobs_group = batch_parser.add_mutually_exclusive_group(required=True)
+    jobs_group.add_argument('--jobs', type=str, help='CSV file with image, body, author and optional width columns')
+    jobs_group.add_argument('--count', type=int, help='Number of memes from random library images and quotes')
+    batch_parser.add_argument('--workers', type=int, help='Number of worker processes', default=None)
+    batch_parser.add_argument('--out', type=str,
+                              help='Directory the memes are saved to, by default the configured batch folder',
+                              default=None)
+    batch_parser.add_argument('--sizing', choices=['scale', 'fit'], help='How the font size is chosen',
+                              default='scale')
+
     args = parser.parse_args()
 
+    if args.command == 'compile':
+        try:
+            snapshot_path, report = compile_quotes(args.out, args.workers)
+            for path, error in report.errors.items():
+                print(f'Failed to ingest {path}: {error}')
+            print(f'Compiled {sum(report.counts.values())} quotes '
+                  f'({sum(report.duplicates.values())} duplicates dropped) into: {snapshot_path}')
+        except Exception as e:
+            print(f'Error: {e}')
+        return
+
+    if args.command == 'batch':
+        try:
+            jobs = read_jobs(args.jobs) if args.jobs else random_jobs(args.count)
+            created = failed = 0
+            for job, meme_path in generate_memes(jobs, args.workers, args.out, args.sizing):
+                if meme_path:
+                    created += 1
+                    print(f'Meme created at: {meme_path}')
+                else:
+                    failed += 1
+                    print(f'Failed to create meme for: {job[0]}')
+            print(f'Created {created} memes, {failed} failed.')
+        except Exception as e:
+            print(f'Error: {e}')
+        return
+
     # Generate meme and print the file path
     try:
         meme_path = generate_meme(args.path, args.body, args.author)
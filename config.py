@@ -21,6 +21,10 @@ class Config:
         logging (dict): Logging configuration settings.
         paths (dict): Directory paths for various categories.
         files (dict): File listings for various categories.
+        tools (dict): Names or paths of external executables.
+        watcher (dict): Settings of the file watcher that reloads content.
+        output_store (dict): Quotas and sweep interval of the generated meme storage.
+        encoding (dict): Output format and Pillow save options of the generated memes.
     """
 
     _instance = None
@@ -73,6 +77,10 @@ class Config:
             self.logging = self.config.get("logging", {})
             self.paths = self.config.get("paths", {})
             self.files = self.config.get("files", {})
+            self.tools = self.config.get("tools", {})
+            self.watcher = self.config.get("watcher", {})
+            self.output_store = self.config.get("output_store", {})
+            self.encoding = self.config.get("encoding", {})
 
             self.initialized = True
 
@@ -105,6 +113,14 @@ class Config:
         
         return path
 
+    def get_tool(self, name):
+        """
+        Get the configured name or path of an external executable.
+        :param name: str - Name of the tool (e.g. 'pdftotext')
+        :return: str - Configured executable, or None if the tool is not configured
+        """
+        return self.tools.get(name)
+
 
 
 def load_config(json_file):
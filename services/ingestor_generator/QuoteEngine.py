@@ -9,31 +9,284 @@ Functions:
     main()
 """
 
-from typing import List
+import importlib
+import os
+from typing import Iterable, Iterator, List, Optional, Tuple
 from util.Utils import Utils
-from services.ingestor_generator.models.CSVIngestor import CSVIngestor
-from services.ingestor_generator.models.DOCXIngestor import DOCXIngestor
 from services.ingestor_generator.base.QuoteModel import QuoteModel
-from services.ingestor_generator.models.TXTIngestor import TXTIngestor
-from services.ingestor_generator.models.PDFIngestor import PDFIngestor
+from services.ingestor_generator.base.QuoteCache import QuoteCache
+from services.ingestor_generator.base.IngestReport import IngestReport
+from services.ingestor_generator.base.QuoteStore import QuoteStore
+from services.ingestor_generator.base.QuoteDeduplicator import QuoteDeduplicator
+from services.ingestor_generator.base.QuoteSnapshot import QuoteSnapshot
 
 class Ingestor:
     """
     Class to handle the ingestion of different file types using specific ingestors.
 
+    Ingestor classes are registered by file extension as dotted import paths and are
+    imported on first use, so their libraries (pandas, pypdf, ...) are only
+    loaded when a file of that type is actually ingested.
+
     Attributes:
-        ingestors (list): List of ingestor classes that can parse different file types.
+        ingestors (dict): Dotted paths of the ingestor classes, by lower-case file extension.
+        cache (QuoteCache): Optional on-disk cache of parsed quotes. Disabled when None.
     """
 
-    ingestors = [CSVIngestor, DOCXIngestor, TXTIngestor, PDFIngestor]  # Add other specific ingestors as needed
+    ingestors = {
+        'csv': 'services.ingestor_generator.models.CSVIngestor.CSVIngestor',
+        'docx': 'services.ingestor_generator.models.DOCXIngestor.DOCXIngestor',
+        'txt': 'services.ingestor_generator.models.TXTIngestor.TXTIngestor',
+        'pdf': 'services.ingestor_generator.models.PDFIngestor.PDFIngestor',
+    }  # Add other specific ingestors as needed
+    cache: Optional[QuoteCache] = None
+    _loaded = {}
 
     @classmethod
-    def parse(cls, path: str) -> List[QuoteModel]:
-        for ingestor in cls.ingestors:
+    def enable_cache(cls, cache_dir: str) -> QuoteCache:
+        """
+        Enable the on-disk cache of parsed quotes.
+
+        Args:
+            cache_dir (str): The directory in which cache entries are stored.
+
+        Returns:
+            QuoteCache: The cache used by subsequent calls to parse.
+        """
+        cls.cache = QuoteCache(cache_dir)
+        return cls.cache
+
+    @classmethod
+    def ingestor_for(cls, path: str):
+        """
+        Find the ingestor class that can handle the given file.
+
+        Args:
+            path (str): The file path to check.
+
+        Returns:
+            type: The matching ingestor class.
+
+        Raises:
+            ValueError: If no ingestor can handle the file.
+        """
+        ext = path.split('.')[-1].lower()
+        if ext in cls.ingestors:
+            ingestor = cls._load_ingestor(ext)
             if ingestor.can_ingest(path):
-                return ingestor.parse(path)
+                return ingestor
         raise ValueError(f"No ingestor available for file {path}")
 
+    @classmethod
+    def _load_ingestor(cls, ext: str):
+        """Import the ingestor class registered for an extension, once."""
+        ingestor = cls._loaded.get(ext)
+        if ingestor is None:
+            module_name, class_name = cls.ingestors[ext].rsplit('.', 1)
+            ingestor = cls._loaded[ext] = getattr(importlib.import_module(module_name), class_name)
+        return ingestor
+
+    @classmethod
+    def parse(cls, path: str, strict: bool = False) -> List[QuoteModel]:
+        """
+        Parse quotes from the given file using the matching ingestor.
+
+        If the cache is enabled and the file is unchanged since it was last parsed,
+        the quotes are loaded from the cache instead.
+
+        Args:
+            path (str): The file path to parse.
+            strict (bool): If True, parsing errors are raised instead of printed.
+
+        Returns:
+            List[QuoteModel]: A list of QuoteModel instances parsed from the file.
+
+        Raises:
+            ValueError: If no ingestor can handle the file.
+        """
+        ingestor = cls.ingestor_for(path)
+
+        # Missing files fall back to the ingestor's default file and are not cached
+        if cls.cache is None or not os.path.isfile(path):
+            return ingestor.parse(path, strict=strict)
+
+        quotes = cls.cache.load(path)
+        if quotes is None:
+            fingerprint = cls.cache.fingerprint(path)
+            quotes = ingestor.parse(path, strict=strict)
+            # Ingestors return an empty list on errors, which must not be cached
+            if quotes:
+                cls.cache.store(path, quotes, fingerprint)
+        return quotes
+
+    @classmethod
+    def iter_parse(cls, path: str) -> Iterator[QuoteModel]:
+        """
+        Lazily parse quotes from the given file using the matching ingestor.
+
+        Quotes are yielded while the file is read, so memory use does not grow
+        with the file size. Unchanged files are served from the cache if it is
+        enabled, but streamed results are not written to the cache since that
+        would require holding the whole file in memory.
+
+        Args:
+            path (str): The file path to parse.
+
+        Yields:
+            QuoteModel: The quotes parsed from the file, in file order.
+
+        Raises:
+            ValueError: If no ingestor can handle the file.
+            FileNotFoundError: If the file does not exist.
+        """
+        ingestor = cls.ingestor_for(path)
+        ingestor.check_path(path, strict=True)
+
+        quotes = cls.cache.load(path) if cls.cache is not None else None
+        if quotes is not None:
+            yield from quotes
+        else:
+            yield from ingestor.iter_parse(path)
+
+    @classmethod
+    def iter_parse_many(cls, paths: Iterable[str],
+                        deduplicator: Optional[QuoteDeduplicator] = None) -> Iterator[QuoteModel]:
+        """
+        Lazily parse quotes from several files, one file after the other.
+
+        Args:
+            paths (Iterable[str]): The file paths to parse.
+            deduplicator (QuoteDeduplicator, optional): If given, quotes already seen
+                in this or an earlier file are dropped and counted per file.
+
+        Yields:
+            QuoteModel: The quotes of all files, in the order of the input paths.
+        """
+        for path in paths:
+            quotes = cls.iter_parse(path)
+            yield from quotes if deduplicator is None else deduplicator.filter(quotes, path)
+
+    @classmethod
+    def parse_many(cls, paths: Iterable[str], workers: Optional[int] = None, dedupe: bool = False) -> IngestReport:
+        """
+        Parse quotes from several files, spreading the files across a process pool.
+
+        Files that are unchanged in the cache are loaded in this process; only the
+        remaining files are sent to the pool. The quotes are merged in the order of
+        the input paths regardless of which file finishes first. Errors are collected
+        per file in the report instead of being printed.
+
+        Args:
+            paths (Iterable[str]): The file paths to parse.
+            workers (int, optional): The number of worker processes. Defaults to the
+                number of CPUs. With a single worker the files are parsed in this process.
+            dedupe (bool): If True, quotes already merged from an earlier file (or earlier
+                in the same file) are dropped and counted in the report.
+
+        Returns:
+            IngestReport: The merged quotes with per-file counts, duplicates and errors.
+        """
+        paths = list(paths)
+        results = {}
+        pending = []
+        for path in paths:
+            quotes = cls.cache.load(path) if cls.cache is not None and os.path.isfile(path) else None
+            if quotes is None:
+                pending.append(path)
+            else:
+                results[path] = (quotes, None, None)
+
+        workers = workers or os.cpu_count() or 1
+        if workers == 1 or len(pending) <= 1:
+            results.update((path, _parse_file(path)) for path in pending)
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+
+            with ProcessPoolExecutor(max_workers=min(workers, len(pending))) as executor:
+                results.update(zip(pending, executor.map(_parse_file, pending)))
+
+        report = IngestReport()
+        deduplicator = QuoteDeduplicator() if dedupe else None
+        for path in paths:
+            quotes, fingerprint, error = results.pop(path)
+            if error is not None:
+                report.errors[path] = error
+                continue
+            if cls.cache is not None and fingerprint is not None:
+                cls.cache.store(path, quotes, fingerprint)
+            if deduplicator is not None:
+                quotes = list(deduplicator.filter(quotes, path))
+                report.duplicates[path] = deduplicator.dropped[path]
+            report.counts[path] = len(quotes)
+            report.quotes.extend(quotes)
+        return report
+
+    @classmethod
+    def load_store(cls, paths: Iterable[str], workers: Optional[int] = None,
+                   dedupe: bool = True) -> Tuple[QuoteStore, IngestReport]:
+        """
+        Ingest several files into an indexed QuoteStore.
+
+        The files are parsed with parse_many, and the author and token indexes
+        are built right away so the first query does not pay for them.
+
+        Args:
+            paths (Iterable[str]): The file paths to parse.
+            workers (int, optional): The number of worker processes.
+            dedupe (bool): Whether duplicate quotes across and within files are dropped.
+
+        Returns:
+            tuple: The indexed QuoteStore and the IngestReport of the files. The
+                quotes of the report are moved into the store.
+        """
+        report = cls.parse_many(paths, workers=workers, dedupe=dedupe)
+        store = QuoteStore.from_quotes(report.quotes)
+        report.quotes = []
+        store.build_index()
+        return store, report
+
+    @classmethod
+    def compile(cls, paths: Iterable[str], snapshot_path: str, workers: Optional[int] = None) -> IngestReport:
+        """
+        Ingest several files and write the deduplicated quotes to a binary snapshot.
+
+        Args:
+            paths (Iterable[str]): The file paths to parse.
+            snapshot_path (str): The path of the snapshot file to write.
+            workers (int, optional): The number of worker processes.
+
+        Returns:
+            IngestReport: The report of the ingested files. Its quotes are not kept.
+        """
+        paths = list(paths)
+        # Fingerprint the files before parsing, so a file modified meanwhile makes the snapshot stale
+        sources = QuoteSnapshot.fingerprints(paths)
+        report = cls.parse_many(paths, workers=workers, dedupe=True)
+        QuoteSnapshot.write(QuoteStore.from_quotes(report.quotes), snapshot_path, sources)
+        report.quotes = []
+        return report
+
+
+def _parse_file(path: str):
+    """
+    Parse a single file in strict mode for Ingestor.parse_many.
+
+    This is a module-level function so it can be sent to worker processes.
+
+    Args:
+        path (str): The file path to parse.
+
+    Returns:
+        tuple: The parsed quotes, the fingerprint taken before parsing and the error
+            message, which is None on success.
+    """
+    try:
+        ingestor = Ingestor.ingestor_for(path)
+        fingerprint = QuoteCache.fingerprint(path) if os.path.isfile(path) else None
+        return ingestor.parse(path, strict=True), fingerprint, None
+    except Exception as e:
+        return [], None, f"{type(e).__name__}: {e}"
+
 
 def main():
 
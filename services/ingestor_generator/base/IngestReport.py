@@ -0,0 +1,21 @@
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+from services.ingestor_generator.base.QuoteModel import QuoteModel
+
+
+@dataclass
+class IngestReport:
+    """
+    A data class to represent the outcome of ingesting several quote files.
+
+    Attributes:
+        quotes (List[QuoteModel]): The quotes of all files, merged in the order of the input paths.
+        counts (Dict[str, int]): The number of quotes ingested from each file.
+        duplicates (Dict[str, int]): The number of duplicate quotes dropped from each file.
+        errors (Dict[str, str]): The error message of each file that could not be ingested.
+    """
+    quotes: List[QuoteModel] = field(default_factory=list)
+    counts: Dict[str, int] = field(default_factory=dict)
+    duplicates: Dict[str, int] = field(default_factory=dict)
+    errors: Dict[str, str] = field(default_factory=dict)
@@ -1,5 +1,6 @@
+import os
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Iterator, List
 
 from services.ingestor_generator.base.QuoteModel import QuoteModel
 
@@ -26,8 +27,23 @@ class IngestorInterface(ABC):
         ext = path.split('.')[-1]
         return ext in cls.allowed_extensions
 
+    @staticmethod
+    def check_path(path: str, strict: bool):
+        """
+        Ensure the file exists when parsing in strict mode.
+
+        Args:
+            path (str): The file path to check.
+            strict (bool): Whether the ingestor is parsing in strict mode.
+
+        Raises:
+            FileNotFoundError: If strict is True and the file does not exist.
+        """
+        if strict and not os.path.isfile(path):
+            raise FileNotFoundError(f"File not found at {path}")
+
     @abstractmethod
-    def parse(cls, path: str) -> List[QuoteModel]:
+    def parse(cls, path: str, strict: bool = False) -> List[QuoteModel]:
         """
         Parse quotes from the given file.
 
@@ -36,12 +52,32 @@ class IngestorInterface(ABC):
 
         Args:
             path (str): The file path to parse.
+            strict (bool): If True, errors are raised instead of printed, and a missing
+                file raises FileNotFoundError instead of falling back to the default file.
 
         Returns:
             List[QuoteModel]: A list of QuoteModel instances parsed from the file.
         """
 
         pass
+
+    @abstractmethod
+    def iter_parse(cls, path: str) -> Iterator[QuoteModel]:
+        """
+        Lazily parse quotes from the given file.
+
+        This method must be implemented by subclasses to yield quotes one at a
+        time while reading the file, so memory use does not grow with the file
+        size. Unlike parse, errors are always raised.
+
+        Args:
+            path (str): The file path to parse.
+
+        Yields:
+            QuoteModel: The quotes parsed from the file, in file order.
+        """
+
+        pass
     
     
 
@@ -0,0 +1,161 @@
+"""
+This module provides an on-disk cache for quotes parsed from source files.
+Unchanged sources are loaded from the cache instead of being parsed again.
+
+Classes:
+    QuoteCache: A persistent cache of parsed quotes keyed by source file fingerprint.
+"""
+
+import hashlib
+import os
+import pickle
+import tempfile
+from typing import List, Optional
+
+from services.ingestor_generator.base.QuoteModel import QuoteModel
+
+
+class QuoteCache:
+    """
+    A persistent cache of parsed quotes keyed by source file fingerprint.
+
+    Every source file gets its own cache entry, named after a hash of its absolute path.
+    An entry stores the fingerprint of the source (path, size, mtime and content hash)
+    together with the parsed (body, author) pairs. A source whose size and mtime are
+    unchanged is served straight from the entry; if only the mtime changed, the content
+    hash decides whether the entry is still valid.
+
+    Attributes:
+        cache_dir (str): The directory in which cache entries are stored.
+    """
+
+    version = 1
+    chunk_size = 1024 * 1024
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @classmethod
+    def content_hash(cls, path: str) -> str:
+        """
+        Compute the SHA-1 hash of the file content.
+
+        Args:
+            path (str): The file path to hash.
+
+        Returns:
+            str: The hexadecimal digest of the file content.
+        """
+        digest = hashlib.sha1()
+        with open(path, 'rb') as file:
+            for chunk in iter(lambda: file.read(cls.chunk_size), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    @classmethod
+    def fingerprint(cls, path: str) -> dict:
+        """
+        Build the fingerprint of a source file.
+
+        Args:
+            path (str): The file path to fingerprint.
+
+        Returns:
+            dict: The absolute path, size, mtime and content hash of the file.
+        """
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        return {
+            'path': path,
+            'size': stat.st_size,
+            'mtime': stat.st_mtime_ns,
+            'sha1': cls.content_hash(path),
+        }
+
+    def entry_path(self, path: str) -> str:
+        """
+        Get the path of the cache entry for a source file.
+
+        Args:
+            path (str): The source file path.
+
+        Returns:
+            str: The path to the cache entry file.
+        """
+        key = hashlib.sha1(os.path.abspath(path).encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}.pickle")
+
+    def load(self, path: str) -> Optional[List[QuoteModel]]:
+        """
+        Load the cached quotes of a source file if the cache entry is still valid.
+
+        Args:
+            path (str): The source file path.
+
+        Returns:
+            List[QuoteModel]: The cached quotes, or None if there is no valid entry.
+        """
+        entry = self._read_entry(path)
+        if entry is None:
+            return None
+
+        fingerprint = entry['fingerprint']
+        stat = os.stat(path)
+        if fingerprint['path'] != os.path.abspath(path) or fingerprint['size'] != stat.st_size:
+            return None
+
+        if fingerprint['mtime'] != stat.st_mtime_ns:
+            # The file was touched; only the content decides whether the entry is stale
+            if fingerprint['sha1'] != self.content_hash(path):
+                return None
+            fingerprint['mtime'] = stat.st_mtime_ns
+            self._write_entry(path, entry)
+
+        return [QuoteModel(body, author) for body, author in entry['quotes']]
+
+    def store(self, path: str, quotes: List[QuoteModel], fingerprint: dict = None):
+        """
+        Store the parsed quotes of a source file.
+
+        Args:
+            path (str): The source file path.
+            quotes (List[QuoteModel]): The quotes parsed from the file.
+            fingerprint (dict, optional): The fingerprint taken before parsing. Taking it
+                before parsing ensures a file modified during parsing is parsed again.
+        """
+        entry = {
+            'version': self.version,
+            'fingerprint': fingerprint or self.fingerprint(path),
+            'quotes': [(quote.body, quote.author) for quote in quotes],
+        }
+        self._write_entry(path, entry)
+
+    def clear(self):
+        """Remove all cache entries."""
+        for file_name in os.listdir(self.cache_dir):
+            if file_name.endswith('.pickle'):
+                os.remove(os.path.join(self.cache_dir, file_name))
+
+    def _read_entry(self, path: str) -> Optional[dict]:
+        """Read the cache entry of a source file, ignoring missing or unreadable entries."""
+        try:
+            with open(self.entry_path(path), 'rb') as file:
+                entry = pickle.load(file)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+            return None
+        if not isinstance(entry, dict) or entry.get('version') != self.version:
+            return None
+        return entry
+
+    def _write_entry(self, path: str, entry: dict):
+        """Atomically write the cache entry of a source file."""
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as file:
+                pickle.dump(entry, file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.entry_path(path))
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
@@ -0,0 +1,97 @@
+"""
+This module provides a streaming deduplication stage for ingested quotes.
+
+Classes:
+    QuoteDeduplicator: Drops quotes that were already seen, counting drops per source.
+"""
+
+import hashlib
+from typing import Dict, Iterable, Iterator, Optional
+
+from services.ingestor_generator.base.QuoteModel import QuoteModel
+
+
+class QuoteDeduplicator:
+    """
+    Drop quotes that were already seen, counting the drops per source.
+
+    Quotes are compared on their normalized (body, author) pair: whitespace is
+    collapsed, case is folded, and a byte order mark or surrounding quotation
+    marks are removed, so the same quote exported to CSV, DOCX, PDF and TXT is
+    recognized. Only an 8-byte hash of each pair is kept in memory.
+
+    Attributes:
+        dropped (Dict[str, int]): The number of duplicates dropped from each source.
+    """
+
+    quote_marks = '"\'“”„‘’«»'
+
+    def __init__(self):
+        self._seen = set()
+        self.dropped: Dict[str, int] = {}
+
+    @classmethod
+    def normalize(cls, text: str) -> str:
+        """
+        Normalize a quote body or author for comparison.
+
+        Args:
+            text (str): The text to normalize.
+
+        Returns:
+            str: The text without surrounding quotation marks, with collapsed whitespace and folded case.
+        """
+        text = ' '.join(text.replace('\ufeff', '').split())
+        return text.strip(cls.quote_marks).strip().casefold()
+
+    @classmethod
+    def key(cls, quote: QuoteModel) -> int:
+        """
+        Hash the normalized (body, author) pair of a quote.
+
+        Args:
+            quote (QuoteModel): The quote to hash.
+
+        Returns:
+            int: A 64-bit hash of the normalized quote.
+        """
+        normalized = f"{cls.normalize(quote.body)}\x00{cls.normalize(quote.author)}"
+        digest = hashlib.blake2b(normalized.encode('utf-8'), digest_size=8).digest()
+        return int.from_bytes(digest, 'big')
+
+    def is_new(self, quote: QuoteModel) -> bool:
+        """
+        Check whether a quote was not seen before, and remember it.
+
+        Args:
+            quote (QuoteModel): The quote to check.
+
+        Returns:
+            bool: True the first time a quote is seen, False for duplicates.
+        """
+        key = self.key(quote)
+        if key in self._seen:
+            return False
+        self._seen.add(key)
+        return True
+
+    def filter(self, quotes: Iterable[QuoteModel], source: Optional[str] = None) -> Iterator[QuoteModel]:
+        """
+        Lazily drop the duplicates from a stream of quotes.
+
+        Args:
+            quotes (Iterable[QuoteModel]): The quotes to filter. May be a generator.
+            source (str, optional): The name under which dropped quotes are counted.
+
+        Yields:
+            QuoteModel: The quotes that were not seen before.
+        """
+        self.dropped.setdefault(source, 0)
+        for quote in quotes:
+            if self.is_new(quote):
+                yield quote
+            else:
+                self.dropped[source] += 1
+
+    def __len__(self) -> int:
+        return len(self._seen)
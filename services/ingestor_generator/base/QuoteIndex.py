@@ -0,0 +1,202 @@
+"""
+This module provides lookup structures over the quotes of a QuoteStore.
+
+Classes:
+    QuoteIndex: An author index and an inverted token index over quote ids.
+"""
+
+import random
+import re
+from array import array
+from bisect import bisect_left
+from typing import Dict, List, Optional
+
+
+class QuoteIndex:
+    """
+    An author index and an inverted token index over quote ids.
+
+    Both indexes map a key to a sorted array of quote ids (posting list).
+    Queries intersect posting lists starting from the shortest one. Much longer
+    lists are probed by binary search, lists of similar length are intersected
+    as sets, so the cost depends on the length of the shortest list rather than
+    on the size of the corpus. Picking one random match, as choice does, only
+    probes a few ids of the shortest list and stays fast even when common
+    words match a large part of the corpus.
+
+    Attributes:
+        author_postings (dict): Lower-cased author name to the ids of their quotes. Any
+            mapping with a get method, such as the MappedPostings of a snapshot.
+        token_postings (dict): Lower-cased body token to the ids of quotes containing it.
+    """
+
+    token_pattern = re.compile(r"\w+")
+    # Lists longer than this many times the current matches are probed by binary search
+    probe_ratio = 16
+    # The number of random ids choice probes before it falls back to a full search
+    choice_attempts = 256
+
+    def __init__(self, store):
+        """
+        Build the indexes of a store.
+
+        Args:
+            store (QuoteStore): The store to index.
+        """
+        self.author_postings: Dict[str, array] = {}
+        self.token_postings: Dict[str, array] = {}
+
+        author_ids = {}
+        for author_id, author in enumerate(store.authors):
+            author_ids.setdefault(self.normalize(author), []).append(author_id)
+        postings_by_author_id = [array('I') for _ in store.authors]
+
+        for quote_id in range(len(store)):
+            postings_by_author_id[store.author_id(quote_id)].append(quote_id)
+            for token in set(self.tokenize(store.body(quote_id))):
+                postings = self.token_postings.get(token)
+                if postings is None:
+                    postings = self.token_postings[token] = array('I')
+                postings.append(quote_id)
+
+        for author, ids in author_ids.items():
+            if len(ids) == 1:
+                self.author_postings[author] = postings_by_author_id[ids[0]]
+            else:
+                # Authors differing only in case share one posting list
+                self.author_postings[author] = array('I', sorted(
+                    quote_id for author_id in ids for quote_id in postings_by_author_id[author_id]))
+
+    @classmethod
+    def from_postings(cls, author_postings, token_postings) -> 'QuoteIndex':
+        """
+        Wrap existing posting lists, e.g. those read from a snapshot, without indexing a store.
+
+        Args:
+            author_postings: The posting lists by normalized author name.
+            token_postings: The posting lists by body token.
+
+        Returns:
+            QuoteIndex: An index answering queries from the given posting lists.
+        """
+        index = cls.__new__(cls)
+        index.author_postings = author_postings
+        index.token_postings = token_postings
+        return index
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """Normalize an author name for lookups."""
+        return ' '.join(text.split()).casefold()
+
+    @classmethod
+    def tokenize(cls, text: str) -> List[str]:
+        """Split text into lower-cased word tokens."""
+        return cls.token_pattern.findall(text.casefold())
+
+    def by_author(self, author: str) -> array:
+        """
+        Find the quotes of an author.
+
+        Args:
+            author (str): The author name, matched case-insensitively.
+
+        Returns:
+            array: The ids of the matching quotes in ascending order.
+        """
+        return self._copy(self.author_postings.get(self.normalize(author), array('I')))
+
+    def search(self, text: Optional[str] = None, author: Optional[str] = None) -> array:
+        """
+        Find the quotes containing all tokens of a text, optionally by a given author.
+
+        Args:
+            text (str, optional): The words that must all occur in the quote body.
+            author (str, optional): The author name, matched case-insensitively.
+
+        Returns:
+            array: The ids of the matching quotes in ascending order. Empty if
+                neither text nor author is given.
+        """
+        postings = self._postings(text, author)
+        if not postings:
+            return array('I')
+
+        matches = self._copy(postings[0])
+        for other in postings[1:]:
+            if not matches:
+                break
+            if len(other) > self.probe_ratio * len(matches):
+                matches = self._probe(matches, other)
+            else:
+                matches = array('I', sorted(set(matches).intersection(other)))
+        return matches
+
+    def choice(self, text: Optional[str] = None, author: Optional[str] = None,
+               rng: Optional[random.Random] = None) -> Optional[int]:
+        """
+        Pick a random quote containing all tokens of a text, optionally by a given author.
+
+        Random ids of the shortest posting list are probed in the other lists until one
+        matches, so every match is equally likely and common words do not require the
+        whole intersection. Only if few ids of the shortest list match does it fall back
+        to search.
+
+        Args:
+            text (str, optional): The words that must all occur in the quote body.
+            author (str, optional): The author name, matched case-insensitively.
+            rng (random.Random, optional): The random generator. Defaults to the random module.
+
+        Returns:
+            int: The id of the selected quote, or None if no quote matches.
+        """
+        rng = rng or random
+        postings = self._postings(text, author)
+        if not postings or not postings[0]:
+            return None
+
+        shortest, others = postings[0], postings[1:]
+        for _ in range(self.choice_attempts):
+            quote_id = shortest[rng.randrange(len(shortest))]
+            if all(self._contains(other, quote_id) for other in others):
+                return quote_id
+        matches = self.search(text, author)
+        return rng.choice(matches) if matches else None
+
+    def _postings(self, text: Optional[str], author: Optional[str]) -> list:
+        """Collect the posting lists of an author and the tokens of a text, shortest first."""
+        postings = []
+        if author:
+            postings.append(self.author_postings.get(self.normalize(author), array('I')))
+        if text:
+            postings.extend(self.token_postings.get(token, array('I')) for token in set(self.tokenize(text)))
+        postings.sort(key=len)
+        return postings
+
+    @staticmethod
+    def _copy(postings) -> array:
+        """Copy a posting list, which may be a memoryview of a snapshot, into a new array."""
+        copy = array('I')
+        copy.frombytes(memoryview(postings).cast('B'))
+        return copy
+
+    @staticmethod
+    def _probe(matches: array, postings) -> array:
+        """Keep the matches found in a much longer sorted posting list, by binary search."""
+        kept = array('I')
+        end = len(postings)
+        position = 0
+        for quote_id in matches:
+            # Matches are ascending, so each search starts where the previous one stopped
+            position = bisect_left(postings, quote_id, position)
+            if position == end:
+                break
+            if postings[position] == quote_id:
+                kept.append(quote_id)
+        return kept
+
+    @staticmethod
+    def _contains(postings: array, quote_id: int) -> bool:
+        """Check whether a sorted posting list contains a quote id."""
+        position = bisect_left(postings, quote_id)
+        return position < len(postings) and postings[position] == quote_id
@@ -5,9 +5,14 @@ class QuoteModel:
     """
     A data class to represent a quote.
 
+    Instances use __slots__ instead of a per-instance __dict__, so they stay
+    small when many quotes are materialized at once.
+
     Attributes:
         body (str): The text of the quote.
         author (str): The author of the quote.
     """
+    __slots__ = ('body', 'author')
+
     body: str
     author: str
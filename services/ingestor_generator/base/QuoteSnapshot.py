@@ -0,0 +1,296 @@
+"""
+This module provides a compact binary snapshot format for a QuoteStore.
+
+A snapshot is written once by the 'compile' CLI command and opened with mmap by
+every server process. Quotes and the posting lists of their index are read in
+place from the mapped file, so all processes share a single page-cache copy of
+the corpus and opening a snapshot costs no parsing or indexing. The fingerprints
+of the source files are stored as well, so a stale snapshot can be detected.
+
+File layout (all sections 8-byte aligned, arrays in the byte order of the writer):
+    header               magic, version, byte order, counts and section positions
+    offsets              n + 1 unsigned 64-bit body offsets
+    author ids           n unsigned 32-bit author ids
+    author offsets       a + 1 unsigned 64-bit author name offsets
+    bodies               the UTF-8 encoded quote bodies
+    authors              the UTF-8 encoded author names
+    author key offsets   k + 1 unsigned 64-bit offsets of the normalized author names
+    author keys          the sorted, UTF-8 encoded normalized author names
+    author list offsets  k + 1 unsigned 64-bit posting list offsets, in quote ids
+    author lists         the unsigned 32-bit quote ids of each author
+    token key offsets    t + 1 unsigned 64-bit offsets of the body tokens
+    token keys           the sorted, UTF-8 encoded body tokens
+    token list offsets   t + 1 unsigned 64-bit posting list offsets, in quote ids
+    token lists          the unsigned 32-bit quote ids of each token
+    sources              a JSON object of the size and mtime of each source file, by path
+
+Classes:
+    QuoteSnapshot: Writes QuoteStores to snapshot files and opens them with mmap.
+    MappedPostings: Posting lists read in place from a snapshot.
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from typing import Dict, Iterable, List, Optional
+
+from services.ingestor_generator.base.QuoteIndex import QuoteIndex
+from services.ingestor_generator.base.QuoteStore import QuoteStore
+
+
+class MappedPostings:
+    """
+    A read-only mapping of keys to posting lists, read in place from a snapshot.
+
+    The keys are sorted and found by binary search, so opening a snapshot builds
+    no dictionary and the posting lists are shared by all processes mapping it.
+    """
+
+    def __init__(self, key_offsets, keys, list_offsets, lists):
+        self._key_offsets = key_offsets
+        self._keys = keys
+        self._list_offsets = list_offsets
+        self._lists = lists
+
+    def get(self, key: str, default=None):
+        """
+        Find the posting list of a key.
+
+        Args:
+            key (str): The normalized author name or token.
+            default: The value returned if the key is not found.
+
+        Returns:
+            memoryview: The sorted quote ids of the key, or default.
+        """
+        # UTF-8 preserves the code point order the keys were sorted in
+        encoded = key.encode(QuoteStore.encoding)
+        low, high = 0, len(self)
+        while low < high:
+            middle = (low + high) // 2
+            probe = self._keys[self._key_offsets[middle]:self._key_offsets[middle + 1]].tobytes()
+            if probe < encoded:
+                low = middle + 1
+            elif probe > encoded:
+                high = middle
+            else:
+                return self._lists[self._list_offsets[middle]:self._list_offsets[middle + 1]]
+        return default
+
+    def __len__(self) -> int:
+        return len(self._key_offsets) - 1
+
+
+class QuoteSnapshot:
+    """
+    Write QuoteStores to snapshot files and open them with mmap.
+
+    Attributes:
+        magic (bytes): The signature at the start of every snapshot file.
+        version (int): The version of the file layout.
+    """
+
+    magic = b'QUOTESNP'
+    version = 2
+    section_count = 14
+    header = struct.Struct(f'<8sHcxIQQQQ{section_count + 1}Q')
+    alignment = 8
+
+    @classmethod
+    def write(cls, store: QuoteStore, path: str, sources: Optional[Dict[str, List[int]]] = None):
+        """
+        Write a store and its index to a snapshot file.
+
+        The file is written next to the target and renamed over it, so processes
+        that still map the previous snapshot keep reading consistent data.
+
+        Args:
+            store (QuoteStore): The store to write.
+            path (str): The path of the snapshot file.
+            sources (dict, optional): The fingerprints of the files the quotes were ingested
+                from, as returned by fingerprints, which is_current compares with the files.
+        """
+        bodies, offsets, author_ids, authors = store.columns()
+        author_offsets, author_names = cls._pack_strings(authors)
+        index = store.index
+        author_sections = cls._pack_postings(index.author_postings)
+        token_sections = cls._pack_postings(index.token_postings)
+        source_section = json.dumps(sources or {}, sort_keys=True).encode('utf-8')
+
+        sections = [memoryview(section).cast('B')
+                    for section in (offsets, author_ids, author_offsets, bodies, author_names,
+                                    *author_sections, *token_sections, source_section)]
+        positions = []
+        position = cls.header.size
+        for section in sections:
+            position = cls._align(position)
+            positions.append(position)
+            position += section.nbytes
+        positions.append(position)
+
+        byteorder = b'<' if sys.byteorder == 'little' else b'>'
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as file:
+                file.write(cls.header.pack(cls.magic, cls.version, byteorder, 0, len(store), len(authors),
+                                           len(index.author_postings), len(index.token_postings),
+                                           *positions))
+                for section, section_position in zip(sections, positions):
+                    file.write(b'\0' * (section_position - file.tell()))
+                    file.write(section)
+            # mkstemp creates private files, but the snapshot is shared with the server processes
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    @classmethod
+    def open(cls, path: str) -> QuoteStore:
+        """
+        Open a snapshot file as a read-only QuoteStore backed by mmap.
+
+        The index of the store reads its posting lists from the mapped file as well.
+
+        Args:
+            path (str): The path of the snapshot file.
+
+        Returns:
+            QuoteStore: A read-only, indexed store reading quotes from the mapped file.
+
+        Raises:
+            ValueError: If the file is not a snapshot, has an unsupported version,
+                or was written on a machine with a different byte order.
+        """
+        with open(path, 'rb') as file:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(mapped)
+
+        count, author_count, author_key_count, token_count, positions = cls._read_header(view, path)
+        sections = [view[start:end] for start, end in zip(positions, positions[1:])]
+        offsets = sections[0][:8 * (count + 1)].cast('Q')
+        author_ids = sections[1][:4 * count].cast('I')
+        author_offsets = sections[2][:8 * (author_count + 1)].cast('Q')
+        bodies = sections[3][:offsets[count]]
+        author_names = sections[4]
+        authors = [str(author_names[author_offsets[i]:author_offsets[i + 1]], QuoteStore.encoding)
+                   for i in range(author_count)]
+        author_postings = cls._open_postings(sections[5:9], author_key_count)
+        token_postings = cls._open_postings(sections[9:13], token_count)
+
+        return QuoteStore.from_buffers(bodies, offsets, author_ids, authors,
+                                       QuoteIndex.from_postings(author_postings, token_postings))
+
+    @classmethod
+    def sources(cls, path: str) -> Dict[str, List[int]]:
+        """
+        Read the fingerprints of the source files of a snapshot.
+
+        Args:
+            path (str): The path of the snapshot file.
+
+        Returns:
+            dict: The [size, mtime] of each source file, by absolute path.
+
+        Raises:
+            ValueError: If the file is not a snapshot of the current version.
+        """
+        with open(path, 'rb') as file:
+            *_, positions = cls._read_header(file.read(cls.header.size), path)
+            file.seek(positions[-2])
+            return json.loads(file.read(positions[-1] - positions[-2]).decode('utf-8'))
+
+    @classmethod
+    def is_current(cls, path: str, sources: Iterable[str]) -> bool:
+        """
+        Check whether a snapshot was compiled from exactly the given, unchanged files.
+
+        Args:
+            path (str): The path of the snapshot file.
+            sources (Iterable[str]): The files the quotes are ingested from now.
+
+        Returns:
+            bool: True if no file was added, removed or modified since the snapshot was
+                compiled, False otherwise or if the file is not a current snapshot.
+        """
+        try:
+            return cls.sources(path) == cls.fingerprints(sources)
+        except (OSError, ValueError) as e:
+            print(f"Cannot read quote snapshot {path}: {e}")
+            return False
+
+    @staticmethod
+    def fingerprints(paths: Iterable[str]) -> Dict[str, List[int]]:
+        """
+        Fingerprint source files by size and modification time.
+
+        Args:
+            paths (Iterable[str]): The file paths. Missing files are left out.
+
+        Returns:
+            dict: The [size, mtime] of each file, by absolute path.
+        """
+        fingerprints = {}
+        for path in paths:
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            fingerprints[os.path.abspath(path)] = [stat.st_size, stat.st_mtime_ns]
+        return fingerprints
+
+    @classmethod
+    def _read_header(cls, data, path: str):
+        """Validate the header and return the quote, author, author key and token counts and the section positions."""
+        if len(data) < cls.header.size:
+            raise ValueError(f"{path} is not a quote snapshot.")
+        magic, version, byteorder, _, *counts = cls.header.unpack_from(data)
+        if magic != cls.magic:
+            raise ValueError(f"{path} is not a quote snapshot.")
+        if version != cls.version:
+            raise ValueError(f"Unsupported quote snapshot version {version}, expected {cls.version}.")
+        if byteorder != (b'<' if sys.byteorder == 'little' else b'>'):
+            raise ValueError("The quote snapshot was written with a different byte order.")
+        return (*counts[:4], counts[4:])
+
+    @staticmethod
+    def _pack_strings(strings: Iterable[str]):
+        """Encode strings into an offset table and one buffer."""
+        offsets = array('Q', [0])
+        data = bytearray()
+        for string in strings:
+            data += string.encode(QuoteStore.encoding)
+            offsets.append(len(data))
+        return offsets, data
+
+    @classmethod
+    def _pack_postings(cls, postings: Dict[str, array]):
+        """Serialize posting lists sorted by key into key offsets, keys, list offsets and lists."""
+        keys = sorted(postings)
+        key_offsets, key_data = cls._pack_strings(keys)
+        list_offsets = array('Q', [0])
+        lists = array('I')
+        for key in keys:
+            lists.extend(postings[key])
+            list_offsets.append(len(lists))
+        return key_offsets, key_data, list_offsets, lists
+
+    @staticmethod
+    def _open_postings(sections, key_count: int) -> MappedPostings:
+        """Wrap the four sections of serialized posting lists."""
+        key_offsets, keys, list_offsets, lists = sections
+        key_offsets = key_offsets[:8 * (key_count + 1)].cast('Q')
+        list_offsets = list_offsets[:8 * (key_count + 1)].cast('Q')
+        return MappedPostings(key_offsets, keys, list_offsets, lists[:4 * list_offsets[key_count]].cast('I'))
+
+    @classmethod
+    def _align(cls, position: int) -> int:
+        """Round a file position up to the section alignment."""
+        return (position + cls.alignment - 1) // cls.alignment * cls.alignment
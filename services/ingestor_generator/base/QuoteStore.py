@@ -0,0 +1,274 @@
+"""
+This module provides a compact, columnar container for large numbers of quotes.
+
+Classes:
+    QuoteStore: A columnar store of quotes with interned authors.
+"""
+
+import random
+from array import array
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from services.ingestor_generator.base.QuoteIndex import QuoteIndex
+from services.ingestor_generator.base.QuoteModel import QuoteModel
+
+
+class QuoteStore:
+    """
+    A columnar store of quotes with interned authors.
+
+    Quote bodies are kept UTF-8 encoded in a single buffer, delimited by an
+    offset table, and every author is stored once and referenced by an integer
+    id. This costs 12 bytes per quote on top of the encoded body, instead of a
+    Python object per quote and per string. Quotes are materialized as
+    QuoteModel instances only when they are accessed.
+
+    The store supports len(), indexing and iteration, so it can be used
+    wherever a list of QuoteModel instances was used, including random.choice.
+    Author and full-text queries are answered by a QuoteIndex, built by
+    build_index or on the first query, and discarded when quotes are added.
+
+    A store can also wrap read-only buffers, such as a memory-mapped
+    QuoteSnapshot, in which case quotes are read in place without copying.
+    """
+
+    encoding = 'utf-8'
+
+    def __init__(self):
+        self._bodies = bytearray()
+        self._offsets = array('Q', [0])
+        self._author_ids = array('I')
+        self._authors: List[str] = []
+        self._author_lookup = {}
+        self._index: Optional[QuoteIndex] = None
+        self._readonly = False
+
+    @classmethod
+    def from_quotes(cls, quotes: Iterable[QuoteModel]) -> 'QuoteStore':
+        """
+        Build a store from quotes.
+
+        Args:
+            quotes (Iterable[QuoteModel]): The quotes to store. May be a generator.
+
+        Returns:
+            QuoteStore: A new store holding the quotes.
+        """
+        store = cls()
+        store.extend(quotes)
+        return store
+
+    @classmethod
+    def from_buffers(cls, bodies, offsets, author_ids, authors: List[str],
+                     index: Optional[QuoteIndex] = None) -> 'QuoteStore':
+        """
+        Build a read-only store over existing column buffers without copying them.
+
+        Args:
+            bodies: The UTF-8 encoded bodies, e.g. a memoryview of a memory-mapped file.
+            offsets: The n + 1 body offsets, e.g. a memoryview cast to 'Q'.
+            author_ids: The n author ids, e.g. a memoryview cast to 'I'.
+            authors (List[str]): The distinct authors, indexed by author id.
+            index (QuoteIndex, optional): A prebuilt index of the quotes. Defaults to
+                building the index on the first query.
+
+        Returns:
+            QuoteStore: A store that reads quotes from the buffers. Adding quotes raises TypeError.
+        """
+        store = cls()
+        store._bodies, store._offsets, store._author_ids = bodies, offsets, author_ids
+        store._authors = list(authors)
+        store._author_lookup = {author: author_id for author_id, author in enumerate(store._authors)}
+        store._index = index
+        store._readonly = True
+        return store
+
+    def columns(self) -> Tuple[bytes, array, array, List[str]]:
+        """
+        Get the column buffers of the store, e.g. to serialize it.
+
+        Returns:
+            tuple: The encoded bodies, the body offsets, the author ids and the authors.
+        """
+        return self._bodies, self._offsets, self._author_ids, self._authors
+
+    def add(self, body: str, author: str) -> int:
+        """
+        Add a quote to the store.
+
+        Args:
+            body (str): The text of the quote.
+            author (str): The author of the quote.
+
+        Returns:
+            int: The id of the new quote, which is its index in the store.
+
+        Raises:
+            TypeError: If the store is read-only.
+        """
+        if self._readonly:
+            raise TypeError("Cannot add quotes to a read-only QuoteStore.")
+        author_id = self._author_lookup.get(author)
+        if author_id is None:
+            author_id = len(self._authors)
+            self._authors.append(author)
+            self._author_lookup[author] = author_id
+
+        self._index = None
+        self._bodies += body.encode(self.encoding)
+        self._offsets.append(len(self._bodies))
+        self._author_ids.append(author_id)
+        return len(self._author_ids) - 1
+
+    def append(self, quote: QuoteModel) -> int:
+        """
+        Add a QuoteModel to the store.
+
+        Args:
+            quote (QuoteModel): The quote to add.
+
+        Returns:
+            int: The id of the new quote.
+        """
+        return self.add(quote.body, quote.author)
+
+    def extend(self, quotes: Iterable[QuoteModel]):
+        """
+        Add several quotes to the store.
+
+        Args:
+            quotes (Iterable[QuoteModel]): The quotes to add. May be a generator.
+        """
+        for quote in quotes:
+            self.add(quote.body, quote.author)
+
+    def body(self, quote_id: int) -> str:
+        """Get the body of a quote by id."""
+        return str(self._bodies[self._offsets[quote_id]:self._offsets[quote_id + 1]], self.encoding)
+
+    def author(self, quote_id: int) -> str:
+        """Get the author of a quote by id."""
+        return self._authors[self._author_ids[quote_id]]
+
+    def author_id(self, quote_id: int) -> int:
+        """Get the interned author id of a quote by id."""
+        return self._author_ids[quote_id]
+
+    @property
+    def authors(self) -> List[str]:
+        """The distinct authors, indexed by author id."""
+        return list(self._authors)
+
+    @property
+    def nbytes(self) -> int:
+        """The approximate size of the quote columns in bytes, excluding the author table."""
+        return (len(self._bodies) + self._offsets.itemsize * len(self._offsets)
+                + self._author_ids.itemsize * len(self._author_ids))
+
+    def build_index(self) -> QuoteIndex:
+        """
+        Build the author and token indexes of the store.
+
+        Returns:
+            QuoteIndex: The index used by by_author and search.
+        """
+        self._index = QuoteIndex(self)
+        return self._index
+
+    @property
+    def index(self) -> QuoteIndex:
+        """The index of the store, built on first access."""
+        return self._index or self.build_index()
+
+    def by_author(self, author: str) -> array:
+        """
+        Find the quotes of an author.
+
+        Args:
+            author (str): The author name, matched case-insensitively.
+
+        Returns:
+            array: The ids of the matching quotes in ascending order.
+        """
+        return self.index.by_author(author)
+
+    def search(self, text: Optional[str] = None, author: Optional[str] = None) -> array:
+        """
+        Find the quotes containing all words of a text, optionally by a given author.
+
+        Args:
+            text (str, optional): The words that must all occur in the quote body.
+            author (str, optional): The author name, matched case-insensitively.
+
+        Returns:
+            array: The ids of the matching quotes in ascending order.
+        """
+        return self.index.search(text, author)
+
+    def random_match(self, text: Optional[str] = None, author: Optional[str] = None,
+                     rng: random.Random = None) -> Optional[QuoteModel]:
+        """
+        Pick a random quote containing all words of a text, optionally by a given author.
+
+        Unlike choosing from the result of search, this does not collect all matches,
+        so it stays fast when common words match a large part of the corpus.
+
+        Args:
+            text (str, optional): The words that must all occur in the quote body.
+            author (str, optional): The author name, matched case-insensitively.
+            rng (random.Random, optional): The random generator. Defaults to the random module.
+
+        Returns:
+            QuoteModel: The selected quote, or None if no quote matches.
+        """
+        quote_id = self.index.choice(text, author, rng)
+        return None if quote_id is None else self[quote_id]
+
+    def random_quote(self, rng: random.Random = None) -> QuoteModel:
+        """
+        Pick a random quote.
+
+        Args:
+            rng (random.Random, optional): The random generator. Defaults to the random module.
+
+        Returns:
+            QuoteModel: The selected quote.
+
+        Raises:
+            IndexError: If the store is empty.
+        """
+        if not self._author_ids:
+            raise IndexError("Cannot choose from an empty QuoteStore.")
+        return self[(rng or random).randrange(len(self))]
+
+    def sample(self, k: int, rng: random.Random = None) -> List[QuoteModel]:
+        """
+        Pick k distinct random quotes.
+
+        Args:
+            k (int): The number of quotes to pick.
+            rng (random.Random, optional): The random generator. Defaults to the random module.
+
+        Returns:
+            List[QuoteModel]: The selected quotes.
+        """
+        return [self[quote_id] for quote_id in (rng or random).sample(range(len(self)), k)]
+
+    def __len__(self) -> int:
+        return len(self._author_ids)
+
+    def __getitem__(self, quote_id: int) -> QuoteModel:
+        if not isinstance(quote_id, int):
+            raise TypeError(f"QuoteStore indices must be integers, not {type(quote_id).__name__}")
+        if quote_id < 0:
+            quote_id += len(self)
+        if not 0 <= quote_id < len(self):
+            raise IndexError("QuoteStore index out of range")
+        return QuoteModel(self.body(quote_id), self.author(quote_id))
+
+    def __iter__(self) -> Iterator[QuoteModel]:
+        for quote_id in range(len(self)):
+            yield QuoteModel(self.body(quote_id), self.author(quote_id))
+
+    def __repr__(self) -> str:
+        return f"QuoteStore({len(self)} quotes, {len(self._authors)} authors)"
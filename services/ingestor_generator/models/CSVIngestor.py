@@ -1,10 +1,9 @@
+import csv
 import os
-from typing import List
+from typing import Iterator, List, Optional
 from util.Utils import Utils
 from services.ingestor_generator.base.IngestorInterface import IngestorInterface
 from services.ingestor_generator.base.QuoteModel import QuoteModel
-import pandas as pd
-from typing import List
 
 
 class CSVIngestor(IngestorInterface):
@@ -12,40 +11,133 @@ class CSVIngestor(IngestorInterface):
     An ingestor class to parse quotes from CSV files.
 
     This class inherits from the IngestorInterface and implements the
-    parse method to read quotes from CSV files.
+    parse method to read quotes from CSV files. Only the body and author
+    columns are read. Small files are read with the stdlib csv module,
+    large files with the pandas C parser in chunks of whole columns.
+
+    Attributes:
+        columns (tuple): The names of the body and author columns.
+        chunksize (int): The number of rows read at a time by pandas.
+        delimiter (str): The field delimiter.
+        encoding (str): The file encoding.
+        engine (str): 'csv', 'pandas' or 'auto' to choose by file size.
+        pandas_threshold (int): The file size in bytes from which 'auto' uses pandas.
     """
     allowed_extensions = ['csv']
-   
+    columns = ('body', 'author')
+    chunksize = 100000
+    delimiter = ','
+    encoding = 'utf-8-sig'
+    engine = 'auto'
+    pandas_threshold = 16 * 1024 * 1024
 
     @classmethod
-    def parse(cls, path: str) -> List[QuoteModel]:
-        
+    def parse(cls, path: str, strict: bool = False) -> List[QuoteModel]:
+
         """
         Parse quotes from a CSV file and return a list of QuoteModel instances.
 
         This method reads a CSV file specified by the given path, extracts
         quote data, and returns a list of QuoteModel instances representing
-        the quotes. If the CSV file is empty, a warning message is printed.
+        the quotes. If the CSV file is empty, no quotes are returned.
         In case of other errors, an error message is printed.
 
         Args:
             path (str): The file path to the CSV file containing the quotes.
+            strict (bool): If True, errors are raised instead of printed.
 
         Returns:
             List[QuoteModel]: A list of QuoteModel instances parsed from the CSV file.
         """
-        
-        quotes = []
+
+        cls.check_path(path, strict)
         # Use the utility function to check and adjust the file path
         path = Utils.validate_image_path(path, Utils.retrieve_file_path('default','default.csv'))
         try:
-            data = pd.read_csv(path)
-            for _, row in data.iterrows():
-                new_quote = QuoteModel(body=row['body'], author=row['author'])
-                quotes.append(new_quote)
-        except pd.errors.EmptyDataError:
-            print("Warning: The CSV file is empty.")
+            return list(cls.iter_parse(path))
         except Exception as e:
+            if strict:
+                raise
             print(f"An error occurred: {e}")
-        return quotes
-    
+            return []
+
+    @classmethod
+    def iter_parse(cls, path: str, delimiter: Optional[str] = None, encoding: Optional[str] = None,
+                   engine: Optional[str] = None) -> Iterator[QuoteModel]:
+        """
+        Lazily parse quotes from a CSV file.
+
+        Rows with an empty body or author are skipped.
+
+        Args:
+            path (str): The file path to the CSV file containing the quotes.
+            delimiter (str, optional): The field delimiter. Defaults to the class setting.
+            encoding (str, optional): The file encoding. Defaults to the class setting.
+            engine (str, optional): 'csv', 'pandas' or 'auto'. Defaults to the class setting.
+
+        Yields:
+            QuoteModel: The quotes parsed from the CSV file.
+
+        Raises:
+            ValueError: If the engine is unknown or the body or author column is missing.
+        """
+        delimiter = delimiter or cls.delimiter
+        encoding = encoding or cls.encoding
+        engine = engine or cls.engine
+
+        if engine == 'auto':
+            engine = 'pandas' if os.path.getsize(path) >= cls.pandas_threshold else 'csv'
+            if engine == 'pandas' and not cls._pandas_available():
+                engine = 'csv'
+
+        if engine == 'csv':
+            return cls._iter_csv(path, delimiter, encoding)
+        if engine == 'pandas':
+            return cls._iter_pandas(path, delimiter, encoding)
+        raise ValueError(f"Unknown CSV engine '{engine}', expected 'auto', 'csv' or 'pandas'.")
+
+    @classmethod
+    def _iter_csv(cls, path: str, delimiter: str, encoding: str) -> Iterator[QuoteModel]:
+        """Yield quotes read row by row with the stdlib csv module."""
+        with open(path, 'r', encoding=encoding, newline='') as file:
+            reader = csv.reader(file, delimiter=delimiter)
+            header = next(reader, None)
+            if header is None:
+                return
+            try:
+                body_index, author_index = (header.index(column) for column in cls.columns)
+            except ValueError:
+                raise ValueError(f"CSV file must have the columns {cls.columns}.") from None
+
+            width = max(body_index, author_index)
+            for row in reader:
+                if len(row) > width:
+                    body, author = row[body_index], row[author_index]
+                    if body and author:
+                        yield QuoteModel(body=body, author=author)
+
+    @classmethod
+    def _iter_pandas(cls, path: str, delimiter: str, encoding: str) -> Iterator[QuoteModel]:
+        """Yield quotes built from whole columns of chunks read with pandas."""
+        import pandas as pd
+
+        body_column, author_column = cls.columns
+        try:
+            reader = pd.read_csv(path, sep=delimiter, encoding=encoding, usecols=list(cls.columns),
+                                 dtype=str, keep_default_na=False, chunksize=cls.chunksize)
+        except pd.errors.EmptyDataError:
+            return
+
+        with reader:
+            for chunk in reader:
+                chunk = chunk[(chunk[body_column] != '') & (chunk[author_column] != '')]
+                yield from map(QuoteModel, chunk[body_column].tolist(), chunk[author_column].tolist())
+
+    @staticmethod
+    def _pandas_available() -> bool:
+        """Check whether pandas can be imported."""
+        try:
+            import pandas  # noqa: F401
+        except ImportError:
+            return False
+        return True
@@ -1,6 +1,6 @@
-import os
-from typing import List
-from docx import Document
+import zipfile
+from typing import Iterator, List
+from xml.etree import ElementTree
 
 from services.ingestor_generator.base.IngestorInterface import IngestorInterface
 from services.ingestor_generator.base.QuoteModel import QuoteModel
@@ -16,8 +16,17 @@ class DOCXIngestor(IngestorInterface):
     """
     allowed_extensions = ['docx']
 
+    document_part = 'word/document.xml'
+    namespace = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+    body_tag = f'{namespace}body'
+    paragraph_tag = f'{namespace}p'
+    run_tag = f'{namespace}r'
+    text_tag = f'{namespace}t'
+    tab_tag = f'{namespace}tab'
+    break_tags = (f'{namespace}br', f'{namespace}cr')
+
     @classmethod
-    def parse(cls, path: str) -> List[QuoteModel]:
+    def parse(cls, path: str, strict: bool = False) -> List[QuoteModel]:
         """
         Parse quotes from a DOCX file and return a list of QuoteModel instances.
 
@@ -29,23 +38,86 @@ class DOCXIngestor(IngestorInterface):
 
         Args:
             path (str): The file path to the DOCX file containing the quotes.
+            strict (bool): If True, errors are raised instead of printed.
 
         Returns:
             List[QuoteModel]: A list of QuoteModel instances parsed from the DOCX file.
         """
-        quotes = []
+        cls.check_path(path, strict)
         # Use the utility function to check and adjust the file path
-        path = Utils.validate_image_path(path, Utils.retrieve_file_path('default','default.docx')) 
+        path = Utils.validate_image_path(path, Utils.retrieve_file_path('default','default.docx'))
         try:
-            doc = Document(path)
-            for para in doc.paragraphs:
-                if para.text != "":
-                    parse = para.text.split(' - ')
-                    if len(parse) >= 2:
-                        new_quote = QuoteModel(body=parse[0], author=parse[1])
-                        quotes.append(new_quote)
+            return list(cls.iter_parse(path))
         except Exception as e:
             # Handle any type of Exception that might occur during the document read
+            if strict:
+                raise
             print(f"An error occurred while parsing the DOCX file: {e}")
-        
-        return quotes
\ No newline at end of file
+            return []
+
+    @classmethod
+    def iter_parse(cls, path: str) -> Iterator[QuoteModel]:
+        """
+        Lazily parse quotes from a DOCX file, one paragraph at a time.
+
+        Args:
+            path (str): The file path to the DOCX file containing the quotes.
+
+        Yields:
+            QuoteModel: The quotes parsed from the DOCX file.
+        """
+        for text in cls.iter_paragraphs(path):
+            if text != "":
+                parse = text.split(' - ')
+                if len(parse) >= 2:
+                    yield QuoteModel(body=parse[0], author=parse[1])
+
+    @classmethod
+    def iter_paragraphs(cls, path: str) -> Iterator[str]:
+        """
+        Lazily read the text of the body paragraphs of a DOCX file.
+
+        The main document part is streamed out of the zip archive through an
+        incremental XML parser, and every top-level element of the body is
+        discarded once it has been read, so memory use stays flat regardless
+        of the document size. Like python-docx, only paragraphs directly in
+        the body are read (not those in tables), only the runs directly in a
+        paragraph are read (not those in hyperlinks or text boxes), tabs
+        become '\t' and line breaks become '\n'.
+
+        Args:
+            path (str): The file path to the DOCX file.
+
+        Yields:
+            str: The text of each body paragraph, in document order.
+        """
+        with zipfile.ZipFile(path) as archive, archive.open(cls.document_part) as document:
+            body = None
+            depth = 0
+            for event, element in ElementTree.iterparse(document, events=('start', 'end')):
+                if event == 'start':
+                    depth += 1
+                    if body is None and element.tag == cls.body_tag:
+                        body, body_depth = element, depth
+                    continue
+
+                depth -= 1
+                if body is not None and depth == body_depth:
+                    # A top-level element of the body is complete
+                    if element.tag == cls.paragraph_tag:
+                        yield cls._paragraph_text(element)
+                    body.remove(element)
+
+    @classmethod
+    def _paragraph_text(cls, paragraph) -> str:
+        """Join the text of the direct runs of a paragraph element, like python-docx."""
+        parts = []
+        for run in paragraph.iterfind(cls.run_tag):
+            for element in run:
+                if element.tag == cls.text_tag:
+                    parts.append(element.text or '')
+                elif element.tag == cls.tab_tag:
+                    parts.append('\t')
+                elif element.tag in cls.break_tags:
+                    parts.append('\n')
+        return ''.join(parts)
@@ -1,9 +1,10 @@
-import os
 import subprocess
-from typing import List
+from collections import deque
+from itertools import islice
+from typing import Iterator, List
 from services.ingestor_generator.base.QuoteModel import QuoteModel
 from services.ingestor_generator.base.IngestorInterface import IngestorInterface
-from util.Utils import Utils  
+from util.Utils import Utils
 
 class PDFIngestor(IngestorInterface):
     """
@@ -11,9 +12,17 @@ class PDFIngestor(IngestorInterface):
 
     This class inherits from the IngestorInterface and implements the
     parse method to read quotes from PDF files.
+
+    Attributes:
+        backend (str): 'pdftotext', 'pypdf' or 'auto' to use the first one available.
+        pages_per_chunk (int): The number of pages converted by one pdftotext process.
+        workers (int): The number of pdftotext processes run in parallel.
     """
     allowed_extensions = ['pdf']
-    
+    backend = 'auto'
+    pages_per_chunk = 16
+    workers = 4
+
     @classmethod
     def can_ingest(cls, path: str) -> bool:
         """
@@ -28,19 +37,20 @@ class PDFIngestor(IngestorInterface):
         return path.split('.')[-1].lower() in cls.allowed_extensions
 
     @classmethod
-    def parse(cls, path: str) -> List[QuoteModel]:
+    def parse(cls, path: str, strict: bool = False) -> List[QuoteModel]:
         """
         Parse quotes from a PDF file and return a list of QuoteModel instances.
 
         This method reads a PDF file specified by the given path, converts it to text,
         extracts quote data, and returns a list of QuoteModel instances representing
-        the quotes. Each line in the PDF file is expected to contain a quote in the 
-        format "quote - author". If the file cannot be ingested due to an unsupported 
+        the quotes. Each line in the PDF file is expected to contain a quote in the
+        format "quote - author". If the file cannot be ingested due to an unsupported
         file extension, a ValueError is raised. If an error occurs during PDF processing,
         an error message is printed and an empty list is returned.
 
         Args:
             path (str): The file path to the PDF file containing the quotes.
+            strict (bool): If True, errors are raised instead of printed.
 
         Returns:
             List[QuoteModel]: A list of QuoteModel instances parsed from the PDF file.
@@ -50,32 +60,140 @@ class PDFIngestor(IngestorInterface):
         """
         if not cls.can_ingest(path):
             raise ValueError("Cannot ingest given file extension, allowed extensions are: {}".format(cls.allowed_extensions))
-       
+
+        cls.check_path(path, strict)
         # Use the utility function to check and adjust the file path
         path = Utils.validate_image_path(path, Utils.retrieve_file_path('default','default.pdf'))
-       
-        temp_txt = '/tmp/temp_file.txt'
-        
+
         try:
-            # Attempt to convert PDF to text using pdftotext
-            subprocess.run(['/Applications/xpdf/bin64/pdftotext', '-layout', path, temp_txt], check=True)
-            quotes = []
-            with open(temp_txt, 'r', encoding='utf-8') as file:
-                for line in file:
-                    line = line.strip()
-                    if line:
-                        parts = line.split(' - ')
-                        if len(parts) == 2:
-                            quote, author = parts
-                            quotes.append(QuoteModel(quote.strip(), author.strip()))
+            return list(cls.iter_parse(path))
         except Exception as e:
             # Handle exceptions related to file processing or subprocess execution
+            if strict:
+                raise
             print(f"Failed to process PDF file: {e}")
             return []  # Return an empty list or handle differently based on your application needs
+
+    @classmethod
+    def iter_parse(cls, path: str) -> Iterator[QuoteModel]:
+        """
+        Lazily parse quotes from a PDF file while it is converted to text.
+
+        Args:
+            path (str): The file path to the PDF file containing the quotes.
+
+        Yields:
+            QuoteModel: The quotes parsed from the PDF file.
+        """
+        for line in cls.iter_text(path):
+            line = line.strip()
+            if line:
+                parts = line.split(' - ')
+                if len(parts) == 2:
+                    quote, author = parts
+                    yield QuoteModel(quote.strip(), author.strip())
+
+    @classmethod
+    def iter_text(cls, path: str) -> Iterator[str]:
+        """
+        Lazily extract the text lines of a PDF file with the configured backend.
+
+        The 'pdftotext' backend streams the stdout of the executable configured
+        under tools.pdftotext, so no temporary file is written. PDFs with more
+        than pages_per_chunk pages are split into page ranges that are converted
+        in parallel and yielded in page order. The 'pypdf' backend extracts the
+        text in process, page by page. With 'auto', pdftotext is preferred and
+        pypdf is used if the executable cannot be found.
+
+        Args:
+            path (str): The file path to the PDF file.
+
+        Yields:
+            str: The text lines of the PDF file, in page order.
+
+        Raises:
+            FileNotFoundError: If no extraction backend is available.
+            subprocess.CalledProcessError: If pdftotext fails.
+        """
+        if cls.backend in ('auto', 'pdftotext'):
+            executable = Utils.retrieve_tool_path('pdftotext')
+            if executable is not None:
+                page_count = cls._page_count(path)
+                if page_count > cls.pages_per_chunk:
+                    return cls._iter_pdftotext_pages(executable, path, page_count)
+                return cls._iter_pdftotext(executable, path)
+            if cls.backend == 'pdftotext':
+                raise FileNotFoundError("pdftotext executable not found, configure it under tools.pdftotext.")
+
+        if cls.backend in ('auto', 'pypdf') and cls._pypdf_available():
+            return cls._iter_pypdf(path)
+        raise FileNotFoundError("No PDF backend available, install pdftotext or the pypdf package.")
+
+    @classmethod
+    def _iter_pdftotext(cls, executable: str, path: str) -> Iterator[str]:
+        """Yield the lines of the whole document from the stdout of pdftotext."""
+        command = [executable, '-layout', path, '-']
+        process = subprocess.Popen(command, stdout=subprocess.PIPE, encoding='utf-8')
+        completed = False
+        try:
+            yield from process.stdout
+            completed = True
         finally:
-            # Clean up by ensuring the temporary file is removed
-            if os.path.exists(temp_txt):
-                os.remove(temp_txt)
-        
-        return quotes
+            # Stop pdftotext if the consumer closed the generator early
+            if not completed:
+                process.kill()
+            process.stdout.close()
+            returncode = process.wait()
+        if returncode != 0:
+            raise subprocess.CalledProcessError(returncode, command)
+
+    @classmethod
+    def _iter_pdftotext_pages(cls, executable: str, path: str, page_count: int) -> Iterator[str]:
+        """Yield the lines of page ranges converted by concurrent pdftotext processes."""
+        def convert(first_page):
+            last_page = min(first_page + cls.pages_per_chunk - 1, page_count)
+            command = [executable, '-layout', '-f', str(first_page), '-l', str(last_page), path, '-']
+            return subprocess.run(command, stdout=subprocess.PIPE, encoding='utf-8', check=True).stdout
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        first_pages = iter(range(1, page_count + 1, cls.pages_per_chunk))
+        with ThreadPoolExecutor(max_workers=cls.workers) as executor:
+            # Keep at most `workers` ranges in flight so memory stays bounded
+            pending = deque(executor.submit(convert, page) for page in islice(first_pages, cls.workers))
+            while pending:
+                text = pending.popleft().result()
+                for page in islice(first_pages, 1):
+                    pending.append(executor.submit(convert, page))
+                yield from text.splitlines()
+
+    @classmethod
+    def _iter_pypdf(cls, path: str) -> Iterator[str]:
+        """Yield the lines of each page extracted in process with pypdf."""
+        from pypdf import PdfReader
 
+        with open(path, 'rb') as file:
+            for page in PdfReader(file).pages:
+                yield from page.extract_text(extraction_mode='layout').splitlines()
+
+    @classmethod
+    def _page_count(cls, path: str) -> int:
+        """Read the page count with pdfinfo, or return 0 if it is not available."""
+        executable = Utils.retrieve_tool_path('pdfinfo')
+        if executable is None:
+            return 0
+        result = subprocess.run([executable, path], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                                encoding='utf-8', errors='replace')
+        for line in result.stdout.splitlines():
+            if line.startswith('Pages:'):
+                return int(line.split(':', 1)[1])
+        return 0
+
+    @staticmethod
+    def _pypdf_available() -> bool:
+        """Check whether pypdf can be imported."""
+        try:
+            import pypdf  # noqa: F401
+        except ImportError:
+            return False
+        return True
@@ -1,4 +1,4 @@
-from typing import List
+from typing import Iterator, List
 from services.ingestor_generator.base.IngestorInterface import IngestorInterface
 from services.ingestor_generator.base.QuoteModel import QuoteModel
 from util.Utils import Utils
@@ -13,7 +13,7 @@ class TXTIngestor(IngestorInterface):
     allowed_extensions = ['txt']
 
     @classmethod
-    def parse(cls, path: str) -> List[QuoteModel]:
+    def parse(cls, path: str, strict: bool = False) -> List[QuoteModel]:
         """
         Parse quotes from a text file and return a list of QuoteModel instances.
 
@@ -25,24 +25,38 @@ class TXTIngestor(IngestorInterface):
 
         Args:
             path (str): The file path to the text file containing the quotes.
+            strict (bool): If True, errors are raised instead of printed.
 
         Returns:
             List[QuoteModel]: A list of QuoteModel instances parsed from the text file.
         """
+        cls.check_path(path, strict)
         # Use the utility function to check and adjust the file path
-        path = Utils.validate_image_path(path, Utils.retrieve_file_path('default','default.txt')) 
+        path = Utils.validate_image_path(path, Utils.retrieve_file_path('default','default.txt'))
         try:
-            quotes = []
-            with open(path, 'r', encoding='utf-8') as file:  # Ensuring to handle encoding
-                lines = file.readlines()
-                for line in lines:
-                    if line.strip():
-                        parse = line.strip().split(' - ')
-                        if len(parse) >= 2:
-                            new_quote = QuoteModel(body=parse[0], author=parse[1])
-                            quotes.append(new_quote)
-            return quotes
+            return list(cls.iter_parse(path))
         except Exception as e:
             # Handle exceptions related to file opening or reading
+            if strict:
+                raise
             print(f"An error occurred while reading the text file: {e}")
-            return []  
+            return []
+
+    @classmethod
+    def iter_parse(cls, path: str) -> Iterator[QuoteModel]:
+        """
+        Lazily parse quotes from a text file, one line at a time.
+
+        Args:
+            path (str): The file path to the text file containing the quotes.
+
+        Yields:
+            QuoteModel: The quotes parsed from the text file.
+        """
+        with open(path, 'r', encoding='utf-8') as file:  # Ensuring to handle encoding
+            for line in file:
+                line = line.strip()
+                if line:
+                    parse = line.split(' - ')
+                    if len(parse) >= 2:
+                        yield QuoteModel(body=parse[0], author=parse[1])
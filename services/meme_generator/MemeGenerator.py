@@ -3,8 +3,13 @@ This module provides functionality to generate memes given an image path and a q
 If no image path or quote is provided, random selections are made from available images and quotes.
 
 Functions:
-    generate_meme(path=None, body=None, author=None): Generate a meme with the specified parameters.
+    generate_meme(path=None, body=None, author=None, output_dir=None): Generate a meme with the specified parameters.
+    compile_quotes(out=None, workers=None): Compile all quote files into a binary snapshot.
+    generate_memes(jobs, workers=None, output_dir=None, sizing='scale'): Render many memes in parallel.
+    read_jobs(path): Read meme jobs from a CSV file.
+    random_jobs(count): Create meme jobs from random library images and quotes.
 """
+import csv
 import os
 import random
 from services.ingestor_generator.base.QuoteModel import QuoteModel
@@ -13,7 +18,7 @@ from services.meme_generator.models.MemeEngine import ImageCaptioner
 
 from util.Utils import Utils
 
-def generate_meme(path=None, body=None, author=None):
+def generate_meme(path=None, body=None, author=None, output_dir=None):
 
     """
     Generate a meme given a path and a quote.
@@ -22,6 +27,8 @@ def generate_meme(path=None, body=None, author=None):
         path (str, optional): Path to an image file. Defaults to None.
         body (str, optional): Quote body to add to the image. Defaults to None.
         author (str, optional): Quote author to add to the image. Defaults to None.
+        output_dir (str, optional): Directory the meme is saved to. Defaults to the configured
+            'output' directory.
     
     Returns:
         str: Path to the generated meme image.
@@ -33,9 +40,8 @@ def generate_meme(path=None, body=None, author=None):
     img = None
     quote = None
 
-    base_dir = Utils.locate_project_root(os.getcwd())
+    base_dir = Utils.project_root()
     images_dir = Utils.retrieve_file_dir('images')
-    quotes_dir = Utils.retrieve_file_dir('quotes')
 
 
     # Select a random image if no path is provided
@@ -49,28 +55,125 @@ def generate_meme(path=None, body=None, author=None):
 
     # Select a random quote if no body and author are provided
     if body is None:
-        quote_files = [
-            os.path.join(quotes_dir, "DogQuotesCSV.csv"),
-            os.path.join(quotes_dir, "DogQuotesDOCX.docx"),
-            os.path.join(quotes_dir, "DogQuotesPDF.pdf"),
-            os.path.join(quotes_dir, "DogQuotesTXT.txt")
-        ]
-        quotes = []
-        for f in quote_files:
-            quotes.extend(Ingestor.parse(f))
-
+        quotes = load_quotes()
         quote = random.choice(quotes) if quotes else None
     else:
         if author is None:
             raise Exception('Author Required if Body is Used')
         quote = QuoteModel(body, author)
     
-    # Get the path to the 'tmp' directory within the calling script's directory
-    tmp_directory = Utils.get_calling_child_script_directory('tmp')
     # Generate the meme using the MemeEngine class
-    meme = ImageCaptioner(tmp_directory)
+    meme = ImageCaptioner(output_dir)
 
     meme_path = meme.make_meme(img, quote.body, quote.author)
+    # Remove old memes beyond the configured quotas of the output directory
+    meme.store.sweep()
     return meme_path
 
 
+def load_quotes():
+    """
+    Ingest the quotes of the library quote files.
+
+    Returns:
+        list: The deduplicated quotes. Files that cannot be ingested are reported and skipped.
+    """
+    quotes_dir = Utils.retrieve_file_dir('quotes')
+    quote_files = [
+        os.path.join(quotes_dir, "DogQuotesCSV.csv"),
+        os.path.join(quotes_dir, "DogQuotesDOCX.docx"),
+        os.path.join(quotes_dir, "DogQuotesPDF.pdf"),
+        os.path.join(quotes_dir, "DogQuotesTXT.txt")
+    ]
+    Ingestor.enable_cache(Utils.retrieve_file_dir('cache'))
+    report = Ingestor.parse_many(quote_files, dedupe=True)
+    for f, error in report.errors.items():
+        print(f"Failed to ingest {f}: {error}")
+    return report.quotes
+
+
+def generate_memes(jobs, workers=None, output_dir=None, sizing='scale'):
+    """
+    Render many memes on a pool of worker processes.
+
+    Args:
+        jobs (Iterable[tuple]): The memes to render, as (img_path, text, author) or
+            (img_path, text, author, width) tuples. May be a generator.
+        workers (int, optional): Number of worker processes. Defaults to the number of CPUs.
+        output_dir (str, optional): Directory the memes are saved to. Defaults to the configured
+            'batch' directory, which is kept apart from the 'output' directory so the quota
+            sweeps of single memes never remove a batch.
+        sizing (str): How the font size is chosen, 'scale' or 'fit'.
+
+    Returns:
+        Iterator[tuple]: Each job with the path of its meme, in the order they complete.
+    """
+    output_dir = output_dir or Utils.retrieve_file_dir('batch')
+    return ImageCaptioner(output_dir).make_memes(jobs, workers=workers, sizing=sizing)
+
+
+def read_jobs(path):
+    """
+    Lazily read meme jobs from a CSV file.
+
+    The file has a header with the columns 'image', 'body' and 'author', and optionally
+    'width'. Relative image paths are resolved against the project root. A width that
+    is not an integer is passed on as it is, so that job fails on its own when it is
+    rendered instead of stopping the batch.
+
+    Args:
+        path (str): Path to the CSV file.
+
+    Yields:
+        tuple: The (img_path, body, author, width) of each meme.
+    """
+    base_dir = Utils.project_root()
+    with open(path, newline='', encoding='utf-8-sig') as file:
+        for row in csv.DictReader(file):
+            image = row['image']
+            if not os.path.isabs(image):
+                image = os.path.join(base_dir, image)
+            width = row.get('width') or 500
+            try:
+                width = int(width)
+            except ValueError:
+                pass
+            yield image, row['body'], row['author'], width
+
+
+def random_jobs(count):
+    """
+    Create meme jobs from random library images and quotes.
+
+    Args:
+        count (int): The number of jobs.
+
+    Returns:
+        list: The (img_path, body, author) of each meme.
+    """
+    imgs = Utils.retrieve_file_paths(Utils.retrieve_file_dir('images'), ('.jpg',))
+    quotes = load_quotes()
+    if not imgs or not quotes:
+        raise Exception('No images or quotes available')
+    return [(img, quote.body, quote.author)
+            for img, quote in zip(random.choices(imgs, k=count), random.choices(quotes, k=count))]
+
+
+def compile_quotes(out=None, workers=None):
+    """
+    Compile all quote files into the binary quote snapshot.
+
+    Args:
+        out (str, optional): Path of the snapshot file. Defaults to the configured snapshot path.
+        workers (int, optional): Number of worker processes used for parsing.
+
+    Returns:
+        tuple: The path of the snapshot file and the IngestReport of the quote files.
+    """
+    quotes_dir = Utils.retrieve_file_dir('quotes')
+    quote_files = Utils.retrieve_file_paths(quotes_dir, ('.csv', '.docx', '.pdf', '.txt'))
+    snapshot_path = out or Utils.retrieve_file_path('cache', 'quotes.snapshot')
+
+    Ingestor.enable_cache(Utils.retrieve_file_dir('cache'))
+    report = Ingestor.compile(sorted(quote_files), snapshot_path, workers=workers)
+    return snapshot_path, report
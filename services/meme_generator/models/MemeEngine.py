@@ -7,10 +7,18 @@ Classes:
 """
 
 from PIL import Image, ImageDraw, ImageFont
+import hashlib
+import io
+import itertools
 import os
 import random
+import uuid
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+from util.ImageCache import ImageCache
+from util.OutputStore import OutputStore
+from util.RenderCache import RenderCache
 from util.Utils import Utils
-from PIL import Image
+from services.meme_generator.models.TextLayout import TextLayoutEngine
 
 class ImageCaptioner:
 
@@ -18,14 +26,42 @@ class ImageCaptioner:
     A class to create memes with a given image, text, and author.
     
     Attributes:
-        output_dir (str): The directory where the generated memes will be saved.
+        output_dir (str): The directory where the generated memes will be saved. Defaults to
+            the configured 'output' directory.
+        encoding (dict): The output 'format' (JPEG by default, or e.g. WEBP) and the Pillow
+            save options of the memes, such as quality, progressive and optimize. Defaults to
+            the configured 'encoding'.
+        store (OutputStore): Spreads the memes over sharded subdirectories of output_dir and
+            keeps them within the configured quotas. Its sweeper is started by the owner of
+            the captioner, e.g. the web app.
+        text_layout (TextLayoutEngine): The layout engine shared by all captioners, which
+            caches word widths and caption layouts.
+        image_cache (ImageCache): The cache of decoded and resized images shared by all captioners.
+        render_cache (RenderCache): The cache of encoded seeded memes shared by all captioners.
     """
 
-    def __init__(self, output_dir):
-        self.output_dir = output_dir
+    text_layout = TextLayoutEngine()
+    image_cache = ImageCache()
+    render_cache = RenderCache()
+    sizing_modes = ('scale', 'fit')
+    # In 'fit' mode the caption may cover this share of the image height, with fonts
+    # between min_font_size and this share of the image height
+    fit_height_ratio = 0.5
+    fit_max_size_ratio = 0.1
+    min_font_size = 8
+    # The number of jobs queued per worker process by make_memes
+    jobs_per_worker = 4
+    # File extensions of the output formats, other formats use their lower-case name
+    extensions = {'JPEG': 'jpg', 'WEBP': 'webp'}
+
+    def __init__(self, output_dir=None, store=None, encoding=None):
+        self.output_dir = output_dir or Utils.retrieve_file_dir('output')
         os.makedirs(self.output_dir, exist_ok=True)
+        self.store = store or OutputStore.from_config(self.output_dir, Utils.retrieve_config().output_store)
+        self.encoding = dict(encoding if encoding is not None else Utils.retrieve_config().encoding)
 
-    def make_meme(self, img_path, text, author, width=500) -> str:
+    def make_meme(self, img_path, text, author, width=500, sizing='scale', seed=None,
+                  cache_image=True) -> str:
 
         """
         Creates a meme by adding text and author to an image.
@@ -35,11 +71,204 @@ class ImageCaptioner:
         text (str): The text to be added to the image.
         author (str): The author of the text.
         width (int): The desired width of the output image. Defaults to 500.
+        sizing (str): How the font size is chosen. 'scale' derives it from the length of the
+            text, 'fit' picks the largest size at which the whole caption fits the image.
+            Defaults to 'scale'.
+        seed (int, optional): Makes the meme deterministic. Seeded memes are saved under their
+            render key, so a meme that already exists is returned without rendering it again.
+            Unseeded memes get a unique random filename.
+        cache_image (bool): Whether the resized image is kept in the image cache. Pass False for
+            one-off images, such as uploads, so they do not evict the library images. Defaults to True.
 
          Returns:
         str: The file path to the created meme image.
         """
 
+        if sizing not in self.sizing_modes:
+            raise ValueError(f"Unknown sizing mode '{sizing}', expected one of {self.sizing_modes}.")
+
+        try:
+            img_path = self._resolve_image_path(img_path)
+            image_format, options = self.save_options()
+            extension = self.extensions.get(image_format, image_format.lower())
+            if seed is None:
+                img = self._render(img_path, text, author, width, sizing, random, cache_image)
+
+                # Save the created meme to the output directory with a unique filename
+                out_path = self.store.path_for(f"meme_{uuid.uuid4().hex}.{extension}")
+                self._save(img, out_path, image_format, options)
+                return out_path
+
+            key = self.render_key(img_path, text, author, width, sizing, seed, (image_format, options))
+            out_path = self.store.path_for(f"meme_{key}.{extension}")
+            if os.path.exists(out_path):
+                self.store.touch(out_path)
+            else:
+                img = self._render(img_path, text, author, width, sizing, random.Random(seed), cache_image)
+                self._save(img, out_path, image_format, options)
+            return out_path
+        except Exception as e:
+            print(f"An error occurred: {e}")
+            return ""
+
+    def make_meme_set(self, img_path, text, author, widths=(320, 640, 1280), sizing='scale',
+                      seed=None, cache_image=True) -> Dict[int, str]:
+        """
+        Creates the same meme at several widths, e.g. for the srcset of a responsive image.
+
+        The image is decoded, laid out and drawn once, at the largest width, and the
+        result is scaled down for each smaller width, so the text keeps exactly the same
+        position and proportions at every size. Widths larger than the image are replaced
+        by the width of the image, so the memes are never upscaled.
+
+        Args:
+        img_path (str): The file path to the input image.
+        text (str): The text to be added to the image.
+        author (str): The author of the text.
+        widths (Iterable[int]): The widths of the output images. Defaults to 320, 640 and 1280.
+        sizing (str): How the font size is chosen, see make_meme. Defaults to 'scale'.
+        seed (int, optional): Makes the memes deterministic, see make_meme.
+        cache_image (bool): Whether the resized image is kept in the image cache, see make_meme.
+
+        Returns:
+        Dict[int, str]: The file path of the meme at each width that was created, or an empty
+            dict if the memes could not be created.
+        """
+        if sizing not in self.sizing_modes:
+            raise ValueError(f"Unknown sizing mode '{sizing}', expected one of {self.sizing_modes}.")
+
+        try:
+            img_path = self._resolve_image_path(img_path)
+            if cache_image:
+                source_width = self.image_cache.source_size(img_path)[0]
+            else:
+                # Opening an image only reads its header
+                with Image.open(img_path) as source:
+                    source_width = source.size[0]
+            widths = sorted({min(width, source_width) for width in widths}, reverse=True)
+            image_format, options = self.save_options()
+            extension = self.extensions.get(image_format, image_format.lower())
+            if seed is None:
+                name, rng = uuid.uuid4().hex, random
+            else:
+                name = self.render_key(img_path, text, author, tuple(widths), sizing, seed, (image_format, options))
+                rng = random.Random(seed)
+            paths = {width: self.store.path_for(f"meme_{name}_{width}.{extension}") for width in widths}
+
+            if seed is not None and all(os.path.exists(path) for path in paths.values()):
+                for path in paths.values():
+                    self.store.touch(path)
+                return paths
+
+            img = self._render(img_path, text, author, widths[0], sizing, rng, cache_image)
+            for width in widths:
+                if width != img.size[0]:
+                    # Scale down from the previous, next larger size. Integer factors are reduced by
+                    # averaging pixel blocks first, which is an order of magnitude faster than a full
+                    # Lanczos pass and looks the same
+                    img = img.resize((width, max(1, round(img.size[1] * width / img.size[0]))), Image.LANCZOS,
+                                     reducing_gap=1.0)
+                self._save(img, paths[width], image_format, options)
+            return paths
+        except Exception as e:
+            print(f"An error occurred: {e}")
+            return {}
+
+    def render_to_bytes(self, img_path, text, author, width=500, sizing='scale', image_format=None,
+                        seed=None) -> bytes:
+        """
+        Creates a meme like make_meme, but encodes it into memory instead of saving it.
+
+        Args:
+        img_path (str): The file path to the input image.
+        text (str): The text to be added to the image.
+        author (str): The author of the text.
+        width (int): The desired width of the output image. Defaults to 500.
+        sizing (str): How the font size is chosen, see make_meme. Defaults to 'scale'.
+        image_format (str, optional): The Pillow format the meme is encoded in, with the save
+            options of the encoding. Defaults to the format of the encoding.
+        seed (int, optional): Makes the meme deterministic. Seeded memes are kept in the
+            render cache, so repeated requests are answered without rendering.
+
+        Returns:
+        bytes: The encoded meme image, or empty bytes if the meme could not be created.
+        """
+        if sizing not in self.sizing_modes:
+            raise ValueError(f"Unknown sizing mode '{sizing}', expected one of {self.sizing_modes}.")
+
+        try:
+            img_path = self._resolve_image_path(img_path)
+            image_format, options = self.save_options(image_format)
+            key = None
+            if seed is not None:
+                key = self.render_key(img_path, text, author, width, sizing, seed, (image_format, options))
+                data = self.render_cache.get(key)
+                if data is not None:
+                    return data
+
+            img = self._render(img_path, text, author, width, sizing,
+                               random if seed is None else random.Random(seed))
+            buffer = io.BytesIO()
+            img.save(buffer, format=image_format, **options)
+            data = buffer.getvalue()
+            if key is not None:
+                self.render_cache.put(key, data)
+            return data
+        except Exception as e:
+            print(f"An error occurred: {e}")
+            return b""
+
+    def save_options(self, image_format=None) -> Tuple[str, dict]:
+        """
+        Return the output format and the Pillow save options of the encoding.
+
+        Args:
+        image_format (str, optional): Overrides the format of the encoding.
+
+        Returns:
+        tuple: The upper-case Pillow format and the save options.
+        """
+        options = dict(self.encoding)
+        configured_format = options.pop('format', 'JPEG')
+        return (image_format or configured_format).upper(), options
+
+    @staticmethod
+    def render_key(img_path, text, author, width, sizing, seed, encoding=('JPEG', {})) -> str:
+        """
+        Compute the content address of a seeded meme.
+
+        The key covers everything that determines the rendered image: the image file,
+        identified by its path, size and modification time, the text, the author,
+        the width, the sizing mode, the seed and the encoding.
+
+        Args:
+        img_path (str): The file path to the resolved input image.
+        text (str): The text of the meme.
+        author (str): The author of the text.
+        width (int): The width of the meme.
+        sizing (str): The sizing mode.
+        seed (int): The seed of the text position.
+        encoding (tuple): The Pillow format and save options the meme is encoded with.
+
+        Returns:
+        str: A 32 character hexadecimal key.
+        """
+        stat = os.stat(img_path)
+        image_format, options = encoding
+        fields = (os.path.abspath(img_path), stat.st_size, stat.st_mtime_ns, text, author, width,
+                  sizing, seed, image_format, sorted(options.items()))
+        return hashlib.blake2b(repr(fields).encode('utf-8'), digest_size=16).hexdigest()
+
+    def _save(self, img, out_path, image_format, options):
+        """Save a meme and register it with the output store."""
+        # Write next to the target and rename, so concurrent renders never expose a partial file
+        tmp_path = f"{out_path}.{uuid.uuid4().hex}.tmp"
+        img.save(tmp_path, format=image_format, **options)
+        os.replace(tmp_path, out_path)
+        self.store.add(out_path)
+
+    def _resolve_image_path(self, img_path) -> str:
+        """Return the image path if it is a valid image, otherwise the default image."""
         # Get the default image path
         default_path = Utils.retrieve_file_path('default', 'default.jpg')
 
@@ -47,8 +276,24 @@ class ImageCaptioner:
         img_path = Utils.validate_image_path(img_path, default_path)
 
         # Resolve hidden files by checking if the image path is hidden
-        img_path = Utils.resolve_image_path(img_path, default_path)
+        return Utils.resolve_image_path(img_path, default_path)
 
+    def _render(self, img_path, text, author, width, sizing, rng, cache_image=True) -> Image.Image:
+        """
+        Draw the text and author onto a copy of the image.
+
+        Args:
+        img_path (str): The file path to the resolved input image.
+        text (str): The text to be added to the image.
+        author (str): The author of the text.
+        width (int): The desired width of the output image.
+        sizing (str): How the font size is chosen.
+        rng (random.Random): The random generator that positions the text.
+        cache_image (bool): Whether the resized image is taken from and kept in the image cache.
+
+        Returns:
+        Image.Image: The meme image.
+        """
         # Get the font file path
         font_path_body = Utils.retrieve_file_path('fonts', 'OpenSans-Regular.ttf')
 
@@ -70,90 +315,148 @@ class ImageCaptioner:
         # Combine text and author 
         full_text = f"{text}{author}"
 
-        try:
+        # Add spaces between lowercase and uppercase letters of the displayed author
+        author = Utils.add_spaces(author[1:])
+
+        if cache_image:
+            # Take the image resized to the specified width from the cache, and draw on a copy
+            img = self.image_cache.get(img_path, width).copy()
+        else:
+            # An image that is not cached is not shared, so it is drawn on directly
+            img = self.image_cache.load(img_path, width)
+        height = img.size[1]
+
+        if sizing == 'fit':
+            # Find the largest font size at which the whole caption fits the image
+            layout = self.text_layout.fit(text, author, font_body, font_author, width,
+                                          int(height * self.fit_height_ratio), self.min_font_size,
+                                          int(height * self.fit_max_size_ratio))
+        else:
+            # Adjust the font size to fit the text within the image height
+            font_body_result = Utils.calculate_font_size(font_body, full_text, height)
+
+            # Adjust the font size to fit the text within the image height
+            font_author_result = Utils.calculate_font_size(font_author, full_text, height)
+
+            # Wrap the body and the author into lines that fit within the image width
+            layout = self.text_layout.layout(text, author, font_body_result, font_author_result, width)
+
+        # Create a drawing context
+        draw = ImageDraw.Draw(img)
+
+        # Randomly position the text block within the image boundaries
+        initial_text_x = rng.randint(0, max(0, width - layout.width))
+        initial_text_y = rng.randint(0, max(0, height - layout.height))
+
+        # Draw each line at its precomputed position, stopping at the bottom of the image
+        for line in layout.lines:
+            text_y = initial_text_y + line.y
+            if text_y + line.height > height:
+                break
+            draw.text((initial_text_x + line.x, text_y), line.text, font=line.font, fill="white")
+
+        return img
+
+    def make_memes(self, jobs: Iterable[tuple], workers: Optional[int] = None,
+                   sizing: str = 'scale') -> Iterator[Tuple[tuple, str]]:
+        """
+        Render many memes on a pool of worker processes.
 
-            # Open the image using the provided or default image path
-            with Image.open(img_path) as img:
-
-                # Calculate the aspect ratio and resize the image to the specified width    
-                ratio = width / float(img.size[0])
-                height = int(ratio * img.size[1])
-                img = img.resize((width, height), Image.LANCZOS)
-
-                # Adjust the font size to fit the text within the image height
-                font_body_result = Utils.calculate_font_size(font_body, full_text, height)
-                
-                # Adjust the font size to fit the text within the image height
-                font_author_result = Utils.calculate_font_size(font_author, full_text, height)
-                
-                # Create a drawing context
-                draw = ImageDraw.Draw(img)
-
-                # Split the text into multiple lines to fit within the image width
-                split_text = Utils.split_text_into_lines(draw, full_text, font_body_result, width)
-
-                # Insert a line break at "#" to separate the body of the text from the author
-                formatted_text = Utils.format_text_with_line_breaks(split_text)
-
-                # Splits the formatted text into segments and marks whether each segment is an author
-                text_segments = Utils.get_text_segments(formatted_text)
-
-
-
-
-
-                # Step 1: Calculate the maximum text width among all segments
-                max_text_width = max(
-                    [
-                        draw.textbbox((0, 0), segment, font=font_author_result if is_author else font_body_result)[2]
-                        for segment, is_author in text_segments
-                    ]
-                )
-                # Step 2: Calculate the total text height required for all segments including spaces between them
-                total_text_height = sum(
-                    [
-                        draw.textbbox((0, 0), segment, font=font_author_result if is_author else font_body_result)[3] + 10
-                        for segment, is_author in text_segments
-                    ]
-                )
-
-                # Step 3: Randomly position the initial text within the image boundaries
-                # Ensure the text fits within the width of the image
-                initial_text_x = random.randint(0, max(0, width - max_text_width))
-                # Ensure the text fits within the height of the image
-                initial_text_y = random.randint(0, max(0, height - total_text_height))
-
-                # Initialize the current y position
-                current_y = initial_text_y
-
-                # Step 4: Iterate through each text segment and its corresponding author status
-                for segment, is_author in text_segments:
-                    # If the segment is an author, add spaces between lowercase and uppercase letters
-                    if is_author:
-                        segment = Utils.add_spaces(segment)
-                    # Step 5: Select the appropriate font based on whether the segment is an author
-                    font = font_author_result if is_author else font_body_result
-                    # Step 6: Calculate the bounding box of the text segment to get its width and height
-                    text_bbox = draw.textbbox((0, 0), segment, font=font)
-                    text_height = text_bbox[3] - text_bbox[1]
-
-                    # Set the x position to the initial random value calculated earlier
-                    text_x = initial_text_x
-
-                    # Step 7: Check if the next segment fits within the image height
-                    if current_y + text_height > height:
-                        break  # Stop if the text exceeds the image height
-
-                    # Step 8: Draw the text onto the image at the calculated x and current y positions
-                    draw.text((text_x, current_y), segment, font=font, fill="white")
-
-                    # Step 9: Increment the current y position by the height of the text segment plus some space
-                    current_y += text_height + 10  # Add some space between lines
-
-                # Save the created meme to the output directory with a random filename
-                out_path = os.path.join(self.output_dir, f"meme_{random.randint(0, 1000000)}.jpg")
-                img.save(out_path)
-                return out_path
-        except Exception as e:
-            print(f"An error occurred: {e}")
-            return ""
\ No newline at end of file
+        Each worker loads the fonts once when it starts and keeps its font, layout and
+        image caches for all the memes it renders. Jobs are read lazily and only a few
+        per worker are queued at a time, so a large or generated job list is never held
+        in memory. Results are yielded as soon as they are rendered, not in job order.
+
+        Args:
+            jobs (Iterable[tuple]): The memes to render, as (img_path, text, author) or
+                (img_path, text, author, width) tuples. May be a generator.
+            workers (int, optional): The number of worker processes. Defaults to the
+                number of CPUs. With a single worker the memes are rendered in this process.
+            sizing (str): How the font size is chosen, see make_meme.
+
+        Yields:
+            tuple: Each job together with the path of its meme, or an empty string if
+                the meme could not be created. A malformed job fails on its own and does
+                not stop the other jobs.
+        """
+        if sizing not in self.sizing_modes:
+            raise ValueError(f"Unknown sizing mode '{sizing}', expected one of {self.sizing_modes}.")
+
+        workers = workers or os.cpu_count() or 1
+        if workers == 1:
+            for job in jobs:
+                try:
+                    yield job, self.make_meme(*job, sizing=sizing)
+                except Exception as e:
+                    print(f"Failed to render job {job!r}: {e}")
+                    yield job, ""
+            return
+
+        from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+        jobs = iter(jobs)
+        # Workers use the encoding and store settings of this captioner, not the configured ones
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(self.output_dir, self.encoding, self.store.settings())) as executor:
+            pending = {executor.submit(_render_job, job, sizing): job
+                       for job in itertools.islice(jobs, workers * self.jobs_per_worker)}
+            try:
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        job = pending.pop(future)
+                        for next_job in itertools.islice(jobs, 1):
+                            pending[executor.submit(_render_job, next_job, sizing)] = next_job
+                        try:
+                            path = future.result()
+                        except Exception as e:
+                            print(f"Failed to render job {job!r}: {e}")
+                            path = ""
+                        yield job, path
+            finally:
+                # Drop the queued jobs if the caller stops early
+                for future in pending:
+                    future.cancel()
+
+    def warm_up(self):
+        """Load the configured resources and fonts, so the first meme does not pay for them."""
+        Utils.preload_resources()
+        Utils.load_font(Utils.retrieve_file_path('fonts', 'OpenSans-Regular.ttf'))
+        Utils.load_font(Utils.retrieve_file_path('fonts', 'OpenSans-ExtraBold.ttf'))
+
+
+_worker_captioner = None
+
+
+def _init_worker(output_dir: str, encoding: dict, store_settings: dict):
+    """
+    Create the captioner of a make_memes worker process.
+
+    Workers forked from the same parent inherit its random state, so it is reseeded
+    to give every worker its own text positions.
+
+    Args:
+        output_dir (str): The directory where the generated memes will be saved.
+        encoding (dict): The output format and save options of the memes.
+        store_settings (dict): The settings of the output store, see OutputStore.from_config.
+    """
+    global _worker_captioner
+    random.seed()
+    _worker_captioner = ImageCaptioner(output_dir, OutputStore.from_config(output_dir, store_settings), encoding)
+    _worker_captioner.warm_up()
+
+
+def _render_job(job: tuple, sizing: str) -> str:
+    """
+    Render a single make_memes job in a worker process.
+
+    This is a module-level function so it can be sent to worker processes.
+
+    Args:
+        job (tuple): The (img_path, text, author[, width]) of the meme.
+        sizing (str): How the font size is chosen.
+
+    Returns:
+        str: The path of the meme, or an empty string if it could not be created.
+    """
+    return _worker_captioner.make_meme(*job, sizing=sizing)
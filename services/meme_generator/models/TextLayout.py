@@ -0,0 +1,301 @@
+"""
+This module lays out the caption of a meme before it is drawn.
+
+Each word is measured once per font, lines are wrapped greedily by summing the
+cached word advances, and the resulting line boxes are reused by the draw step,
+so a caption is measured in linear time instead of re-measuring the growing
+line after every word. Complete layouts are cached as well.
+
+Classes:
+    Line: A line of text together with its font and box.
+    TextLayout: The lines of a laid out caption and the size of their block.
+    TextLayoutEngine: Wraps captions into TextLayouts, caching word widths and layouts.
+"""
+
+import threading
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from PIL import ImageFont
+
+from util.Utils import Utils
+
+
+class Line(NamedTuple):
+    """
+    A line of text together with its font and box, relative to the top left of the caption.
+
+    Attributes:
+        text (str): The text of the line.
+        font (ImageFont.FreeTypeFont): The font the line is drawn with.
+        x (int): The left edge of the line.
+        y (int): The top edge of the line.
+        width (int): The advance width of the line.
+        height (int): The height of the line.
+    """
+    text: str
+    font: ImageFont.FreeTypeFont
+    x: int
+    y: int
+    width: int
+    height: int
+
+
+@dataclass(frozen=True)
+class TextLayout:
+    """
+    The lines of a laid out caption and the size of the block they fill.
+
+    Attributes:
+        lines (Tuple[Line, ...]): The lines in drawing order.
+        width (int): The width of the widest line.
+        height (int): The height of the caption, including the space after each segment.
+    """
+    lines: Tuple[Line, ...]
+    width: int
+    height: int
+
+
+class TextLayoutEngine:
+    """
+    Wrap meme captions into TextLayouts, caching word widths and complete layouts.
+
+    A caption consists of the quote body, wrapped with the body font, followed by the
+    author, wrapped with the author font. Segments are separated by segment_spacing
+    pixels and lines within a segment by line_spacing pixels, like Pillow's
+    multiline text.
+
+    Attributes:
+        maxsize (int): The maximum number of layouts kept. The least recently used layout is evicted first.
+        max_words (int): The maximum number of word widths kept per font.
+        hits (int): The number of layouts answered from the cache.
+        misses (int): The number of layouts that were computed.
+    """
+
+    line_spacing = 4
+    segment_spacing = 10
+
+    def __init__(self, maxsize: int = 1024, max_words: int = 65536):
+        self.maxsize = maxsize
+        self.max_words = max_words
+        self.hits = 0
+        self.misses = 0
+        self._layouts: "OrderedDict[tuple, TextLayout]" = OrderedDict()
+        # Word widths live as long as their font, fonts are shared through the font cache
+        self._word_widths: "weakref.WeakKeyDictionary[ImageFont.FreeTypeFont, Dict[str, float]]" = \
+            weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def layout(self, body: str, author: str, body_font: ImageFont.FreeTypeFont,
+               author_font: ImageFont.FreeTypeFont, max_width: int) -> TextLayout:
+        """
+        Lay out a caption, or return the cached layout of the same caption.
+
+        A body of the form "quote - remark" is broken before the dash, as a
+        separate paragraph.
+
+        Args:
+            body (str): The quote body.
+            author (str): The author, as it is displayed.
+            body_font (ImageFont.FreeTypeFont): The font of the body.
+            author_font (ImageFont.FreeTypeFont): The font of the author.
+            max_width (int): The maximum width of a line.
+
+        Returns:
+            TextLayout: The laid out caption.
+        """
+        key = (body, author, self._font_key(body_font), self._font_key(author_font), max_width)
+        with self._lock:
+            layout = self._layouts.get(key)
+            if layout is not None:
+                self._layouts.move_to_end(key)
+                self.hits += 1
+                return layout
+            self.misses += 1
+
+        paragraphs = body.split(" - ")
+        if len(paragraphs) == 2:
+            paragraphs[1] = f"- {paragraphs[1]}"
+        else:
+            paragraphs = [body]
+
+        lines: List[Line] = []
+        y = 0
+        for segment, font in ((paragraphs, body_font), ([author], author_font)):
+            wrapped = [line for paragraph in segment for line in self.wrap(paragraph, font, max_width)]
+            y = self._place(wrapped, font, y, lines)
+        width = max((line.width for line in lines), default=0)
+        layout = TextLayout(tuple(lines), width, y)
+
+        with self._lock:
+            self._layouts[key] = layout
+            while len(self._layouts) > self.maxsize:
+                self._layouts.popitem(last=False)
+        return layout
+
+    def fit(self, body: str, author: str, body_font: ImageFont.FreeTypeFont,
+            author_font: ImageFont.FreeTypeFont, max_width: int, max_height: int,
+            min_size: int, max_size: int) -> TextLayout:
+        """
+        Lay out a caption at the largest font size at which it fits a box.
+
+        The size is found by a binary search between min_size and max_size, so only
+        O(log(max_size - min_size)) layouts are computed, each reusing the cached
+        word widths of its size. Body and author always share the same size. If the
+        caption does not fit even at min_size, the layout at min_size is returned.
+
+        Args:
+            body (str): The quote body.
+            author (str): The author, as it is displayed.
+            body_font (ImageFont.FreeTypeFont): The font of the body, at any size.
+            author_font (ImageFont.FreeTypeFont): The font of the author, at any size.
+            max_width (int): The width of the box.
+            max_height (int): The height of the box.
+            min_size (int): The smallest font size to use.
+            max_size (int): The largest font size to use.
+
+        Returns:
+            TextLayout: The laid out caption.
+        """
+        body_path, author_path = self._font_path(body_font), self._font_path(author_font)
+        if body_path is None or author_path is None:
+            # Fonts that were not loaded from a file cannot be resized
+            return self.layout(body, author, body_font, author_font, max_width)
+
+        def layout_at(size):
+            return self.layout(body, author, Utils.font_cache.get(body_path, size),
+                               Utils.font_cache.get(author_path, size), max_width)
+
+        best = None
+        low, high = min_size, max(min_size, max_size)
+        while low <= high:
+            size = (low + high) // 2
+            layout = layout_at(size)
+            if layout.width <= max_width and layout.height <= max_height:
+                best = layout
+                low = size + 1
+            else:
+                high = size - 1
+        return best if best is not None else layout_at(min_size)
+
+    def wrap(self, text: str, font: ImageFont.FreeTypeFont, max_width: int) -> List[str]:
+        """
+        Greedily wrap text into lines no wider than max_width.
+
+        Line widths are the sums of the cached word and space advances. A single word
+        wider than max_width is kept on a line of its own.
+
+        Args:
+            text (str): The text to wrap.
+            font (ImageFont.FreeTypeFont): The font used to measure the text.
+            max_width (int): The maximum width of a line.
+
+        Returns:
+            List[str]: The wrapped lines.
+        """
+        words = text.split()
+        if not words:
+            return []
+        space = self.word_width(font, ' ')
+        lines = []
+        current = [words[0]]
+        current_width = self.word_width(font, words[0])
+        for word in words[1:]:
+            word_width = self.word_width(font, word)
+            if current_width + space + word_width <= max_width:
+                current.append(word)
+                current_width += space + word_width
+            else:
+                lines.append(' '.join(current))
+                current = [word]
+                current_width = word_width
+        lines.append(' '.join(current))
+        return lines
+
+    def word_width(self, font: ImageFont.FreeTypeFont, word: str) -> float:
+        """
+        Return the advance width of a word, measuring it once per font.
+
+        Args:
+            font (ImageFont.FreeTypeFont): The font used to measure the word.
+            word (str): The word to measure.
+
+        Returns:
+            float: The advance width of the word in pixels.
+        """
+        with self._lock:
+            widths = self._word_widths.get(font)
+            if widths is None:
+                widths = self._word_widths[font] = {}
+            width = widths.get(word)
+        if width is None:
+            # Measure outside of the lock, so other layouts are not blocked
+            width = self._text_length(font, word)
+            with self._lock:
+                if len(widths) >= self.max_words:
+                    widths.clear()
+                widths[word] = width
+        return width
+
+    def clear(self):
+        """Remove all layouts and word widths and reset the counters."""
+        with self._lock:
+            self._layouts.clear()
+            self._word_widths.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self) -> Dict[str, int]:
+        """
+        Report the cache statistics.
+
+        Returns:
+            dict: The hits, misses, current size and maximum size of the layout cache.
+        """
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses,
+                    'size': len(self._layouts), 'maxsize': self.maxsize}
+
+    def _place(self, texts: List[str], font: ImageFont.FreeTypeFont, y: int, lines: List[Line]) -> int:
+        """Append the boxes of the lines of a segment starting at y, and return the top of the next segment."""
+        if not texts:
+            return y
+        line_height = self._line_height(font)
+        for text in texts:
+            # Measure the finished line once, so kerning between words is accounted for
+            lines.append(Line(text, font, 0, y, int(round(self._text_length(font, text))), line_height))
+            y += line_height + self.line_spacing
+        return y - self.line_spacing + self.segment_spacing
+
+    @classmethod
+    def _font_key(cls, font: ImageFont.FreeTypeFont) -> tuple:
+        """Identify a font by its file and size, or by identity if it was not loaded from a file."""
+        path = cls._font_path(font)
+        if path is None:
+            return id(font), None
+        return path, font.size
+
+    @staticmethod
+    def _font_path(font: ImageFont.ImageFont) -> Optional[str]:
+        """Return the file a font was loaded from, or None for bitmap and in-memory fonts."""
+        path = getattr(font, 'path', None)
+        return path if isinstance(path, str) else None
+
+    @staticmethod
+    def _text_length(font: ImageFont.ImageFont, text: str) -> float:
+        """Measure the advance width of text, also with bitmap fonts of older Pillow versions."""
+        if hasattr(font, 'getlength'):
+            return font.getlength(text)
+        return font.getsize(text)[0]
+
+    @staticmethod
+    def _line_height(font: ImageFont.ImageFont) -> int:
+        """Return the height of a line of text, also for bitmap fonts, which have no metrics."""
+        if hasattr(font, 'getmetrics'):
+            ascent, descent = font.getmetrics()
+            return ascent + descent
+        if hasattr(font, 'getbbox'):
+            return font.getbbox('Ay')[3]
+        return font.getsize('Ay')[1]
@@ -0,0 +1,80 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from services.ingestor_generator.base.QuoteModel import QuoteModel
+from services.ingestor_generator.models.CSVIngestor import CSVIngestor
+
+
+class TestCSVIngestor(unittest.TestCase):
+
+    csv_file = 'tests/res/quotes/SimpleLines.csv'
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def write(self, name, text):
+        path = os.path.join(self.tmp_dir, name)
+        with open(path, 'w', encoding='utf-8', newline='') as file:
+            file.write(text)
+        return path
+
+    def parse_both(self, path, **kwargs):
+        return (list(CSVIngestor.iter_parse(path, engine='csv', **kwargs)),
+                list(CSVIngestor.iter_parse(path, engine='pandas', **kwargs)))
+
+    def test_engines_agree_on_fixture(self):
+        quotes, pandas_quotes = self.parse_both(self.csv_file)
+        self.assertEqual(len(quotes), 5)
+        self.assertEqual(pandas_quotes, quotes)
+
+    def test_engines_agree_across_chunks(self):
+        path = self.write('quotes.csv', 'id,author,body\n'
+                                        '1,Author 1,"Line 1, with a comma"\n'
+                                        '2,,Line 2\n'
+                                        '3,Author 3,\n'
+                                        '4,Author 4,Line 4\n'
+                                        '5,Author 5,"Line ""5"""\n')
+        expected = [QuoteModel('Line 1, with a comma', 'Author 1'), QuoteModel('Line 4', 'Author 4'),
+                    QuoteModel('Line "5"', 'Author 5')]
+        with mock.patch.object(CSVIngestor, 'chunksize', 2):
+            quotes, pandas_quotes = self.parse_both(path)
+        self.assertEqual(quotes, expected)
+        self.assertEqual(pandas_quotes, expected)
+
+    def test_delimiter_and_encoding(self):
+        path = os.path.join(self.tmp_dir, 'quotes.csv')
+        with open(path, 'w', encoding='latin-1', newline='') as file:
+            file.write('body;author\nDéjà vu, again;Yogi\n')
+        quotes, pandas_quotes = self.parse_both(path, delimiter=';', encoding='latin-1')
+        self.assertEqual(quotes, [QuoteModel('Déjà vu, again', 'Yogi')])
+        self.assertEqual(pandas_quotes, quotes)
+
+    def test_auto_engine_uses_pandas_above_threshold(self):
+        with mock.patch.object(CSVIngestor, 'pandas_threshold', 0), \
+                mock.patch.object(CSVIngestor, '_iter_pandas', return_value=iter([])) as iter_pandas:
+            list(CSVIngestor.iter_parse(self.csv_file))
+        iter_pandas.assert_called_once()
+
+    def test_missing_column_raises(self):
+        path = self.write('quotes.csv', 'body,name\nLine 1,Author 1\n')
+        for engine in ('csv', 'pandas'):
+            with self.assertRaises(ValueError):
+                list(CSVIngestor.iter_parse(path, engine=engine))
+
+    def test_empty_file_has_no_quotes(self):
+        path = self.write('quotes.csv', '')
+        self.assertEqual(self.parse_both(path), ([], []))
+
+    def test_unknown_engine_raises(self):
+        with self.assertRaises(ValueError):
+            CSVIngestor.iter_parse(self.csv_file, engine='polars')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import os
+import shutil
+import tempfile
+import unittest
+import zipfile
+
+from services.ingestor_generator.base.QuoteModel import QuoteModel
+from services.ingestor_generator.models.DOCXIngestor import DOCXIngestor
+
+
+class TestDOCXIngestor(unittest.TestCase):
+
+    docx_file = 'tests/res/quotes/SimpleLines.docx'
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def write(self, name, paragraphs):
+        path = os.path.join(self.tmp_dir, name)
+        document = ('<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+                    f'<w:body>{"".join(paragraphs)}</w:body></w:document>')
+        with zipfile.ZipFile(path, 'w') as archive:
+            archive.writestr(DOCXIngestor.document_part, document)
+        return path
+
+    def test_parse_fixture(self):
+        self.assertEqual(len(DOCXIngestor.parse(self.docx_file, strict=True)), 5)
+
+    def test_tabs_and_breaks(self):
+        path = self.write('quotes.docx', ['<w:p><w:r><w:t>Line</w:t><w:tab/><w:t>1 - A</w:t>'
+                                          '<w:br/><w:t>uthor 1</w:t></w:r></w:p>'])
+        self.assertEqual(list(DOCXIngestor.iter_paragraphs(path)), ['Line\t1 - A\nuthor 1'])
+
+    def test_only_direct_runs_are_read(self):
+        path = self.write('quotes.docx', ['<w:p><w:r><w:t>Line 1 - </w:t></w:r>'
+                                          '<w:hyperlink><w:r><w:t>link</w:t></w:r></w:hyperlink>'
+                                          '<w:r><w:t>Author 1</w:t>'
+                                          '<w:pict><w:txbxContent><w:p><w:r><w:t>box</w:t></w:r></w:p>'
+                                          '</w:txbxContent></w:pict></w:r></w:p>'])
+        self.assertEqual(DOCXIngestor.parse(path, strict=True), [QuoteModel('Line 1', 'Author 1')])
+
+
+if __name__ == '__main__':
+    unittest.main()
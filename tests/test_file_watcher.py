@@ -0,0 +1,51 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from util.FileWatcher import FileWatcher
+
+
+class TestFileWatcher(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.existing = self.write('quotes.txt', 'Line 1 - Author 1\n')
+        self.changes = []
+        self.watcher = FileWatcher([(self.tmp_dir, ('.txt',))], self.changes.append, interval=0.01)
+
+    def tearDown(self):
+        self.watcher.stop()
+        shutil.rmtree(self.tmp_dir)
+
+    def write(self, name, content):
+        path = os.path.join(self.tmp_dir, name)
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(content)
+        return path
+
+    def test_no_changes(self):
+        self.watcher.check()
+        self.assertEqual(self.changes, [])
+
+    def test_added_changed_and_removed_files(self):
+        added = self.write('more.txt', 'Line 2 - Author 2\n')
+        self.write('ignored.csv', 'body,author\n')
+        self.write('quotes.txt', 'Line 1 - Author 1\nLine 3 - Author 3\n')
+        self.watcher.check()
+        self.assertEqual(self.changes, [{added, self.existing}])
+
+        os.remove(added)
+        self.watcher.check()
+        self.assertEqual(self.changes[-1], {added})
+
+    def test_background_thread(self):
+        self.watcher.start()
+        added = self.write('more.txt', 'Line 2 - Author 2\n')
+        self.watcher.stop()
+        self.watcher.check()
+        self.assertEqual(set().union(*self.changes), {added})
+
+
+if __name__ == '__main__':
+    unittest.main()
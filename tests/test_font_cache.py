@@ -0,0 +1,33 @@
+import unittest
+
+from util.FontCache import FontCache
+from util.Utils import Utils
+
+
+class TestFontCache(unittest.TestCase):
+
+    def setUp(self):
+        self.font_path = Utils.retrieve_file_path('fonts', 'OpenSans-Regular.ttf')
+        self.cache = FontCache(maxsize=2)
+
+    def test_same_font_is_shared(self):
+        font = self.cache.get(self.font_path, 20)
+        self.assertIs(self.cache.get(self.font_path, 20), font)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_least_recently_used_font_is_evicted(self):
+        first = self.cache.get(self.font_path, 10)
+        self.cache.get(self.font_path, 20)
+        self.cache.get(self.font_path, 10)
+        self.cache.get(self.font_path, 30)
+        self.assertEqual(len(self.cache), 2)
+        self.assertIs(self.cache.get(self.font_path, 10), first)
+        self.assertEqual(self.cache.info()['misses'], 3)
+
+    def test_calculate_font_size_keeps_default_font(self):
+        font = Utils.font_cache.load_default()
+        self.assertIs(Utils.calculate_font_size(font, "text", 500), font)
+
+
+if __name__ == '__main__':
+    unittest.main()
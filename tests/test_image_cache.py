@@ -0,0 +1,63 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from PIL import Image
+
+from util.ImageCache import ImageCache
+
+
+class TestImageCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, 'image.jpg')
+        Image.new('RGB', (400, 200), 'red').save(self.path)
+        self.cache = ImageCache()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_resized_image_is_shared(self):
+        image = self.cache.get(self.path, 100)
+        self.assertEqual(image.size, (100, 50))
+        self.assertIs(self.cache.get(self.path, 100), image)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_large_jpeg_is_decoded_at_reduced_scale(self):
+        path = os.path.join(self.tmp_dir, 'large.jpg')
+        Image.new('RGB', (1600, 800), 'blue').save(path)
+        with mock.patch.object(Image.Image, 'resize', autospec=True, side_effect=Image.Image.resize) as resize:
+            image = self.cache.get(path, 100)
+        self.assertEqual(image.size, (100, 50))
+        self.assertEqual(resize.call_args[0][0].size, (200, 100))
+
+    def test_modified_file_is_decoded_again(self):
+        image = self.cache.get(self.path, 100)
+        stat = os.stat(self.path)
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        self.assertIsNot(self.cache.get(self.path, 100), image)
+
+    def test_source_size_is_read_once(self):
+        self.assertEqual(self.cache.source_size(self.path), (400, 200))
+        with mock.patch.object(Image, 'open', side_effect=AssertionError):
+            self.assertEqual(self.cache.source_size(self.path), (400, 200))
+        Image.new('RGB', (300, 100), 'red').save(self.path)
+        stat = os.stat(self.path)
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        self.assertEqual(self.cache.source_size(self.path), (300, 100))
+
+    def test_budget_evicts_least_recently_used(self):
+        self.cache.max_bytes = 45000
+        first = self.cache.get(self.path, 100)
+        self.cache.get(self.path, 120)
+        self.cache.get(self.path, 100)
+        self.cache.get(self.path, 140)
+        self.assertLessEqual(self.cache.nbytes, self.cache.max_bytes)
+        self.assertEqual((self.cache.evictions, len(self.cache)), (1, 2))
+        self.assertIs(self.cache.get(self.path, 100), first)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from services.ingestor_generator.QuoteEngine import Ingestor
+
+
+class TestIngestor(unittest.TestCase):
+
+    csv_file = 'tests/res/quotes/SimpleLines.csv'
+    txt_file = 'tests/res/quotes/SimpleLines.txt'
+    docx_file = 'tests/res/quotes/SimpleLines.docx'
+
+    def test_iter_parse_matches_parse(self):
+        for path in (self.csv_file, self.txt_file, self.docx_file):
+            self.assertEqual(list(Ingestor.iter_parse(path)), Ingestor.parse(path))
+
+    def test_iter_parse_missing_file(self):
+        with self.assertRaises(FileNotFoundError):
+            next(Ingestor.iter_parse('missing.txt'))
+
+    def test_parse_many_keeps_input_order(self):
+        paths = [self.txt_file, self.csv_file, self.docx_file]
+        report = Ingestor.parse_many(paths, workers=2)
+        expected = []
+        for path in paths:
+            expected.extend(Ingestor.parse(path))
+        self.assertEqual(report.quotes, expected)
+        self.assertEqual(report.counts, {path: 5 for path in paths})
+        self.assertEqual(report.errors, {})
+
+    def test_parse_many_drops_duplicates_across_formats(self):
+        report = Ingestor.parse_many([self.csv_file, self.txt_file, self.docx_file], workers=1, dedupe=True)
+        self.assertEqual(len(report.quotes), 5)
+        self.assertEqual(report.duplicates, {self.csv_file: 0, self.txt_file: 5, self.docx_file: 5})
+
+    def test_parse_many_reports_errors(self):
+        report = Ingestor.parse_many([self.csv_file, 'missing.txt', 'quotes.xyz'], workers=1)
+        self.assertEqual(len(report.quotes), 5)
+        self.assertEqual(set(report.errors), {'missing.txt', 'quotes.xyz'})
+        self.assertIn('FileNotFoundError', report.errors['missing.txt'])
+
+    def test_load_store_reads_unchanged_files_from_cache(self):
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir)
+        self.addCleanup(setattr, Ingestor, 'cache', Ingestor.cache)
+        Ingestor.enable_cache(cache_dir)
+        paths = [self.csv_file, self.txt_file]
+        store, _ = Ingestor.load_store(paths, workers=1)
+        with mock.patch('services.ingestor_generator.QuoteEngine._parse_file', side_effect=AssertionError):
+            reloaded, report = Ingestor.load_store(paths, workers=1)
+        self.assertEqual(list(reloaded), list(store))
+        self.assertEqual(report.errors, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
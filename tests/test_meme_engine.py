@@ -0,0 +1,109 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from PIL import Image, ImageFont
+
+from services.meme_generator.models.MemeEngine import ImageCaptioner
+from util.Utils import Utils
+
+
+class TestImageCaptioner(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.captioner = ImageCaptioner(self.tmp_dir)
+        self.image = Utils.retrieve_file_path('images', 'xander_1.jpg')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_render_to_bytes_writes_nothing(self):
+        data = self.captioner.render_to_bytes(self.image, "Quote", "Author", 200)
+        self.assertTrue(data.startswith(b'\xff\xd8'))
+        self.assertEqual(os.listdir(self.tmp_dir), [])
+
+    def test_seeded_meme_is_rendered_once(self):
+        path = self.captioner.make_meme(self.image, "Quote", "Author", 200, seed=7)
+        self.assertTrue(os.path.isfile(path))
+        with mock.patch.object(ImageCaptioner, '_render', side_effect=AssertionError):
+            self.assertEqual(self.captioner.make_meme(self.image, "Quote", "Author", 200, seed=7), path)
+        self.assertNotEqual(self.captioner.make_meme(self.image, "Quote", "Author", 200, seed=8), path)
+
+    def test_seeded_bytes_are_deterministic_and_cached(self):
+        ImageCaptioner.render_cache.clear()
+        data = self.captioner.render_to_bytes(self.image, "Quote", "Author", 200, seed=7)
+        ImageCaptioner.render_cache.clear()
+        self.assertEqual(self.captioner.render_to_bytes(self.image, "Quote", "Author", 200, seed=7), data)
+        with mock.patch.object(ImageCaptioner, '_render', side_effect=AssertionError):
+            self.assertEqual(self.captioner.render_to_bytes(self.image, "Quote", "Author", 200, seed=7), data)
+        self.assertEqual(ImageCaptioner.render_cache.hits, 1)
+
+    def test_meme_set_is_rendered_once_at_every_width(self):
+        with mock.patch.object(ImageCaptioner, '_render', wraps=self.captioner._render) as render:
+            paths = self.captioner.make_meme_set(self.image, "Quote", "Author", (100, 400, 200))
+        render.assert_called_once()
+        self.assertEqual(sorted(paths), [100, 200, 400])
+        for width, path in paths.items():
+            with Image.open(path) as img:
+                self.assertEqual(img.size[0], width)
+        with mock.patch.object(ImageCaptioner, '_render', side_effect=AssertionError):
+            self.assertEqual(self.captioner.make_meme_set(self.image, "Quote", "Author", (100,)), {})
+
+    def test_meme_set_is_not_upscaled(self):
+        with Image.open(self.image) as img:
+            source_width = img.size[0]
+        paths = self.captioner.make_meme_set(self.image, "Quote", "Author",
+                                             (100, source_width + 100, source_width * 2))
+        self.assertEqual(sorted(paths), [100, source_width])
+        with Image.open(paths[source_width]) as img:
+            self.assertEqual(img.size[0], source_width)
+
+    def test_missing_font_falls_back_to_bitmap_font(self):
+        bitmap = getattr(ImageFont, 'load_default_imagefont', ImageFont.load_default)()
+        with mock.patch.object(Utils, 'load_font', return_value=bitmap):
+            path = self.captioner.make_meme(self.image, "Quote", "Author", 200)
+        self.assertTrue(os.path.isfile(path))
+
+    def test_uncached_image_is_not_kept(self):
+        ImageCaptioner.image_cache.clear()
+        self.assertTrue(self.captioner.make_meme(self.image, "Quote", "Author", 210, cache_image=False))
+        self.assertTrue(self.captioner.make_meme_set(self.image, "Quote", "Author", (220,), cache_image=False))
+        self.assertEqual(len(ImageCaptioner.image_cache), 0)
+
+    def test_encoding_selects_format_and_extension(self):
+        captioner = ImageCaptioner(self.tmp_dir, encoding={'format': 'webp', 'quality': 60})
+        path = captioner.make_meme(self.image, "Quote", "Author", 200)
+        self.assertTrue(path.endswith('.webp'))
+        with open(path, 'rb') as file:
+            self.assertEqual(file.read(12)[8:], b'WEBP')
+        jobs = [(self.image, f"Quote {i}", "Author", 200) for i in range(3)]
+        for _, path in captioner.make_memes(jobs, workers=2):
+            self.assertTrue(path.endswith('.webp'))
+
+    def test_make_memes_renders_every_job(self):
+        jobs = [(self.image, f"Quote {i}", "Author", 200) for i in range(5)]
+        results = list(self.captioner.make_memes(iter(jobs), workers=2))
+        self.assertCountEqual([job for job, _ in results], jobs)
+        paths = [path for _, path in results]
+        self.assertEqual(len(set(paths)), len(jobs))
+        for path in paths:
+            self.assertTrue(os.path.isfile(path))
+
+    def test_make_memes_reports_bad_jobs_and_continues(self):
+        jobs = [(self.image, "Quote", "Author", 200), (self.image, "Quote"), (self.image, "Quote", "Author", 'wide'),
+                (self.image, "Quote 2", "Author", 200)]
+        for workers in (1, 2):
+            results = dict(self.captioner.make_memes(iter(jobs), workers=workers))
+            self.assertEqual(set(results), set(jobs))
+            self.assertEqual([bool(results[job]) for job in jobs], [True, False, False, True])
+
+    def test_make_memes_rejects_unknown_sizing(self):
+        with self.assertRaises(ValueError):
+            list(self.captioner.make_memes([], sizing='stretch'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from util.OutputStore import OutputStore
+
+
+class TestOutputStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def write(self, store, name, size=10, age=0):
+        path = store.path_for(name)
+        with open(path, 'wb') as file:
+            file.write(b'x' * size)
+        mtime = time.time() - age
+        os.utime(path, (mtime, mtime))
+        store.add(path)
+        return path
+
+    def test_files_are_sharded(self):
+        store = OutputStore(self.tmp_dir)
+        path = store.path_for('meme_1.jpg')
+        self.assertEqual(os.path.dirname(os.path.dirname(path)), self.tmp_dir)
+        self.assertEqual(len(os.path.basename(os.path.dirname(path))), 2)
+
+    def test_settings_recreate_the_store(self):
+        store = OutputStore(self.tmp_dir, max_bytes=100, max_files=5, max_age=60.0, shard_width=3)
+        copy = OutputStore.from_config(self.tmp_dir, store.settings())
+        self.assertEqual(copy.settings(), store.settings())
+        self.assertEqual(copy.path_for('meme_1.jpg'), store.path_for('meme_1.jpg'))
+
+    def test_sweep_evicts_least_recently_used_over_quota(self):
+        store = OutputStore(self.tmp_dir, max_files=2)
+        oldest = self.write(store, 'meme_1.jpg', age=30)
+        middle = self.write(store, 'meme_2.jpg', age=20)
+        newest = self.write(store, 'meme_3.jpg', age=10)
+        store.sweep()
+        store.touch(middle)
+        self.write(store, 'meme_4.jpg')
+        store.sweep()
+        self.assertFalse(os.path.exists(oldest))
+        self.assertFalse(os.path.exists(newest))
+        self.assertTrue(os.path.exists(middle))
+        self.assertEqual(store.info()['evicted'], 2)
+
+    def test_sweep_respects_byte_quota_and_age(self):
+        store = OutputStore(self.tmp_dir, max_bytes=25, max_age=60)
+        expired = self.write(store, 'meme_1.jpg', age=120)
+        first = self.write(store, 'meme_2.jpg', age=10)
+        second = self.write(store, 'meme_3.jpg', age=5)
+        third = self.write(store, 'meme_4.jpg', age=1)
+        store.sweep()
+        self.assertEqual([os.path.exists(path) for path in (expired, first, second, third)],
+                         [False, False, True, True])
+        self.assertEqual((store.info()['expired'], store.info()['bytes']), (1, 20))
+
+    def test_touch_survives_a_restart(self):
+        store = OutputStore(self.tmp_dir, max_files=1)
+        popular = self.write(store, 'meme_1.jpg', age=30)
+        newer = self.write(store, 'meme_2.jpg', age=10)
+        store.touch(popular)
+        self.assertGreater(os.path.getmtime(popular), os.path.getmtime(newer))
+        OutputStore(self.tmp_dir, max_files=1).sweep()
+        self.assertTrue(os.path.exists(popular))
+        self.assertFalse(os.path.exists(newer))
+
+    def test_files_of_other_processes_are_counted(self):
+        store = OutputStore(self.tmp_dir, max_files=2, rescan_every=2)
+        other = OutputStore(self.tmp_dir, max_files=2, rescan_every=2)
+        store.sweep()
+        other.sweep()
+        oldest = self.write(other, 'meme_1.jpg', age=30)
+        self.write(other, 'meme_2.jpg', age=20)
+        self.write(store, 'meme_3.jpg', age=10)
+        store.sweep()
+        self.assertTrue(os.path.exists(oldest))
+        store.sweep()
+        self.assertFalse(os.path.exists(oldest))
+        self.assertEqual(store.info()['files'], 2)
+
+    def test_other_files_are_kept(self):
+        other = os.path.join(self.tmp_dir, 'style.css')
+        open(other, 'w').close()
+        store = OutputStore(self.tmp_dir, max_files=0)
+        store.sweep()
+        self.assertTrue(os.path.exists(other))
+
+
+if __name__ == '__main__':
+    unittest.main()
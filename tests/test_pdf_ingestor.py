@@ -0,0 +1,52 @@
+import io
+import subprocess
+import unittest
+from unittest import mock
+
+from services.ingestor_generator.base.QuoteModel import QuoteModel
+from services.ingestor_generator.models.PDFIngestor import PDFIngestor
+from util.Utils import Utils
+
+
+class TestPDFIngestor(unittest.TestCase):
+
+    pdf_file = 'tests/res/quotes/SimpleLines.pdf'
+
+    def popen(self, text, returncode=0):
+        process = mock.Mock()
+        process.stdout = io.StringIO(text)
+        process.wait.return_value = returncode
+        return mock.patch('subprocess.Popen', return_value=process)
+
+    def test_parse_with_pypdf_backend(self):
+        with mock.patch.object(PDFIngestor, 'backend', 'pypdf'):
+            quotes = PDFIngestor.parse(self.pdf_file, strict=True)
+        self.assertEqual(quotes, [QuoteModel(f'"Line {i}"', f'Author {i}') for i in range(1, 6)])
+
+    def test_auto_backend_falls_back_to_pypdf(self):
+        with mock.patch.object(Utils, 'retrieve_tool_path', return_value=None), \
+                mock.patch('subprocess.Popen', side_effect=AssertionError):
+            self.assertEqual(len(list(PDFIngestor.iter_parse(self.pdf_file))), 5)
+
+    def test_pdftotext_streams_stdout(self):
+        with self.popen("Line 1 - Author 1\n\nLine 2 - Author 2\n") as popen, \
+                mock.patch.object(Utils, 'retrieve_tool_path', side_effect=['/bin/pdftotext', None]):
+            quotes = list(PDFIngestor.iter_parse(self.pdf_file))
+        self.assertEqual(quotes, [QuoteModel('Line 1', 'Author 1'), QuoteModel('Line 2', 'Author 2')])
+        self.assertEqual(popen.call_args[0][0], ['/bin/pdftotext', '-layout', self.pdf_file, '-'])
+
+    def test_pdftotext_failure_raises(self):
+        with self.popen("Line 1 - Author 1\n", returncode=1):
+            with self.assertRaises(subprocess.CalledProcessError):
+                list(PDFIngestor._iter_pdftotext('/bin/pdftotext', self.pdf_file))
+
+    def test_pdftotext_is_killed_when_closed_early(self):
+        with self.popen("Line 1 - Author 1\nLine 2 - Author 2\n") as popen:
+            lines = PDFIngestor._iter_pdftotext('/bin/pdftotext', self.pdf_file)
+            next(lines)
+            lines.close()
+        popen.return_value.kill.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
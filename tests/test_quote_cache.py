@@ -0,0 +1,51 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from services.ingestor_generator.base.QuoteCache import QuoteCache
+from services.ingestor_generator.base.QuoteModel import QuoteModel
+
+
+class TestQuoteCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.cache = QuoteCache(os.path.join(self.tmp_dir, 'cache'))
+        self.source = os.path.join(self.tmp_dir, 'quotes.txt')
+        with open(self.source, 'w', encoding='utf-8') as file:
+            file.write("Line 1 - Author 1\n")
+        self.quotes = [QuoteModel('Line 1', 'Author 1')]
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_miss_without_entry(self):
+        self.assertIsNone(self.cache.load(self.source))
+
+    def test_hit_after_store(self):
+        self.cache.store(self.source, self.quotes)
+        self.assertEqual(self.cache.load(self.source), self.quotes)
+
+    def test_touched_but_unchanged_file_is_a_hit(self):
+        self.cache.store(self.source, self.quotes)
+        stat = os.stat(self.source)
+        os.utime(self.source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        self.assertEqual(self.cache.load(self.source), self.quotes)
+
+    def test_changed_file_is_a_miss(self):
+        self.cache.store(self.source, self.quotes)
+        stat = os.stat(self.source)
+        with open(self.source, 'w', encoding='utf-8') as file:
+            file.write("Line 2 - Author 2\n")
+        os.utime(self.source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        self.assertIsNone(self.cache.load(self.source))
+
+    def test_clear(self):
+        self.cache.store(self.source, self.quotes)
+        self.cache.clear()
+        self.assertIsNone(self.cache.load(self.source))
+
+
+if __name__ == '__main__':
+    unittest.main()
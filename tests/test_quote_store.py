@@ -0,0 +1,145 @@
+import os
+import random
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from services.ingestor_generator.base.QuoteIndex import QuoteIndex
+from services.ingestor_generator.base.QuoteModel import QuoteModel
+from services.ingestor_generator.base.QuoteSnapshot import MappedPostings, QuoteSnapshot
+from services.ingestor_generator.base.QuoteStore import QuoteStore
+
+
+class TestQuoteStore(unittest.TestCase):
+
+    def setUp(self):
+        self.quotes = [
+            QuoteModel('Chase the mailman', 'Skittle'),
+            QuoteModel('Treat yo self', 'Fluffles'),
+            QuoteModel('Wöof – ünïcode', 'Skittle'),
+        ]
+        self.store = QuoteStore.from_quotes(self.quotes)
+
+    def test_random_access(self):
+        self.assertEqual(len(self.store), 3)
+        self.assertEqual([self.store[i] for i in range(3)], self.quotes)
+        self.assertEqual(self.store[-1], self.quotes[-1])
+        with self.assertRaises(IndexError):
+            self.store[3]
+
+    def test_iteration(self):
+        self.assertEqual(list(self.store), self.quotes)
+
+    def test_authors_are_interned(self):
+        self.assertEqual(self.store.authors, ['Skittle', 'Fluffles'])
+        self.assertEqual(self.store.author_id(0), self.store.author_id(2))
+
+    def test_random_selection(self):
+        rng = random.Random(0)
+        self.assertIn(self.store.random_quote(rng), self.quotes)
+        self.assertIn(random.choice(self.store), self.quotes)
+        self.assertEqual(len(set(q.body for q in self.store.sample(3, rng))), 3)
+
+    def test_by_author(self):
+        self.assertEqual(list(self.store.by_author('skittle')), [0, 2])
+        self.assertEqual(list(self.store.by_author('Nobody')), [])
+
+    def test_search(self):
+        self.assertEqual(list(self.store.search('TREAT')), [1])
+        self.assertEqual(list(self.store.search('the mailman')), [0])
+        self.assertEqual(list(self.store.search('ünïcode', author='Skittle')), [2])
+        self.assertEqual(list(self.store.search('treat', author='Skittle')), [])
+        self.assertEqual(list(self.store.search()), [])
+
+    def test_intersection_strategies_agree(self):
+        store = QuoteStore.from_quotes(QuoteModel(' '.join(f'w{k}' for k in range(1, 7) if i % k == 0), 'Rex')
+                                       for i in range(600))
+        for ratio in (0, 1000):
+            with mock.patch.object(QuoteIndex, 'probe_ratio', ratio):
+                self.assertEqual(list(store.search('w2 w3 w5')), list(range(0, 600, 30)))
+                self.assertEqual(list(store.search('w6 w1')), list(range(0, 600, 6)))
+
+    def test_random_match(self):
+        rng = random.Random(0)
+        self.assertEqual(self.store.random_match('mailman', rng=rng), self.quotes[0])
+        self.assertIn(self.store.random_match(author='skittle', rng=rng), [self.quotes[0], self.quotes[2]])
+        self.assertIsNone(self.store.random_match('treat', 'Skittle', rng))
+        self.assertIsNone(self.store.random_match(rng=rng))
+        with mock.patch.object(QuoteIndex, 'choice_attempts', 0):
+            self.assertEqual(self.store.random_match('ünïcode', 'Skittle', rng), self.quotes[2])
+
+    def test_index_is_rebuilt_after_add(self):
+        self.store.build_index()
+        self.store.add('Treat time', 'Rex')
+        self.assertEqual(list(self.store.search('treat')), [1, 3])
+
+    def test_empty_store(self):
+        with self.assertRaises(IndexError):
+            QuoteStore().random_quote()
+
+
+
+class TestQuoteSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, 'quotes.snapshot')
+        self.quotes = [QuoteModel('Chase the mailman', 'Skittle'), QuoteModel('Wöof', 'Skittle')]
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_round_trip(self):
+        QuoteSnapshot.write(QuoteStore.from_quotes(self.quotes), self.path)
+        store = QuoteSnapshot.open(self.path)
+        self.assertEqual(list(store), self.quotes)
+        self.assertEqual(store.authors, ['Skittle'])
+        self.assertEqual(list(store.search('mailman')), [0])
+
+    def test_snapshot_is_read_only(self):
+        QuoteSnapshot.write(QuoteStore.from_quotes(self.quotes), self.path)
+        with self.assertRaises(TypeError):
+            QuoteSnapshot.open(self.path).add('Treat yo self', 'Fluffles')
+
+    def test_index_is_read_from_snapshot(self):
+        quotes = self.quotes + [QuoteModel('Chase the cat', 'skittle'), QuoteModel('Nap time', 'Fluffles')]
+        QuoteSnapshot.write(QuoteStore.from_quotes(quotes), self.path)
+        store = QuoteSnapshot.open(self.path)
+        self.assertIsInstance(store.index.token_postings, MappedPostings)
+        expected = QuoteStore.from_quotes(quotes)
+        for text, author in (('chase', None), ('Chase the', 'SKITTLE'), (None, 'Skittle'), ('nap', 'Skittle'),
+                             ('missing', None), ('wöof', None)):
+            self.assertEqual(list(store.search(text, author)), list(expected.search(text, author)))
+        self.assertEqual(list(store.by_author(' fluffles ')), [3])
+        self.assertEqual(list(store.by_author('Nobody')), [])
+
+    def test_empty_round_trip(self):
+        QuoteSnapshot.write(QuoteStore(), self.path)
+        store = QuoteSnapshot.open(self.path)
+        self.assertEqual(len(store), 0)
+        self.assertEqual(list(store.search('mailman')), [])
+
+    def test_is_current_tracks_source_files(self):
+        source = os.path.join(self.tmp_dir, 'quotes.txt')
+        with open(source, 'w') as file:
+            file.write('Chase the mailman - Skittle\n')
+        QuoteSnapshot.write(QuoteStore.from_quotes(self.quotes), self.path, QuoteSnapshot.fingerprints([source]))
+        self.assertTrue(QuoteSnapshot.is_current(self.path, [source]))
+
+        extra = os.path.join(self.tmp_dir, 'extra.txt')
+        with open(extra, 'w') as file:
+            file.write('Treat yo self - Fluffles\n')
+        self.assertFalse(QuoteSnapshot.is_current(self.path, [source, extra]))
+        os.utime(source, ns=(0, 0))
+        self.assertFalse(QuoteSnapshot.is_current(self.path, [source]))
+
+    def test_rejects_other_files(self):
+        with open(self.path, 'wb') as file:
+            file.write(b'body,author\n' * 10)
+        with self.assertRaises(ValueError):
+            QuoteSnapshot.open(self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
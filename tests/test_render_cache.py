@@ -0,0 +1,26 @@
+import unittest
+
+from util.RenderCache import RenderCache
+
+
+class TestRenderCache(unittest.TestCase):
+
+    def test_budget_evicts_least_recently_used(self):
+        cache = RenderCache(max_bytes=10)
+        cache.put('a', b'1234')
+        cache.put('b', b'1234')
+        self.assertEqual(cache.get('a'), b'1234')
+        cache.put('c', b'1234')
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), b'1234')
+        self.assertEqual(cache.info()['evictions'], 1)
+        self.assertEqual(cache.nbytes, 8)
+
+    def test_image_over_budget_is_not_cached(self):
+        cache = RenderCache(max_bytes=2)
+        cache.put('a', b'1234')
+        self.assertEqual(len(cache), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,37 @@
+import os
+import random
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from PIL import Image
+
+from app.Routes import MemeApp
+
+
+class TestMemeApp(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        for name in ('a.jpg', 'b.jpg', 'c.jpg', 'd.jpg'):
+            Image.new('RGB', (20, 20), 'red').save(os.path.join(self.tmp_dir, name))
+        # Only the loading methods are tested, without starting the server and its threads
+        self.app = MemeApp.__new__(MemeApp)
+        self.app.images_dir = self.tmp_dir
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_seeded_image_does_not_depend_on_listing_order(self):
+        names = sorted(os.listdir(self.tmp_dir))
+        chosen = []
+        for listing in (names, names[::-1]):
+            with mock.patch('os.listdir', return_value=listing):
+                imgs = self.app.load_images()
+            chosen.append([random.Random(seed).choice(imgs) for seed in range(10)])
+        self.assertEqual(chosen[0], chosen[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
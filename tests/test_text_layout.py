@@ -0,0 +1,61 @@
+import unittest
+
+from PIL import ImageFont
+
+from services.meme_generator.models.TextLayout import TextLayoutEngine
+from util.Utils import Utils
+
+
+class TestTextLayoutEngine(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = TextLayoutEngine()
+        self.body_font = Utils.font_cache.get(Utils.retrieve_file_path('fonts', 'OpenSans-Regular.ttf'), 20)
+        self.author_font = Utils.font_cache.get(Utils.retrieve_file_path('fonts', 'OpenSans-ExtraBold.ttf'), 20)
+        self.text = "To bork or not to bork that is the question and it is a long one"
+
+    def test_wrapped_lines_fit_within_width(self):
+        lines = self.engine.wrap(self.text, self.body_font, 150)
+        self.assertGreater(len(lines), 1)
+        self.assertEqual(' '.join(lines), self.text)
+        for line in lines:
+            self.assertLessEqual(self.body_font.getlength(line), 150 + 1)
+
+    def test_long_word_keeps_its_own_line(self):
+        self.assertEqual(self.engine.wrap("a Supercalifragilistic b", self.body_font, 20),
+                         ["a", "Supercalifragilistic", "b"])
+
+    def test_layout_places_author_below_body(self):
+        layout = self.engine.layout(self.text, "Bork", self.body_font, self.author_font, 150)
+        self.assertEqual(layout.lines[-1].text, "Bork")
+        self.assertIs(layout.lines[-1].font, self.author_font)
+        tops = [line.y for line in layout.lines]
+        self.assertEqual(tops, sorted(tops))
+        self.assertEqual(layout.width, max(line.width for line in layout.lines))
+        self.assertGreater(layout.height, layout.lines[-1].y)
+
+    def test_layouts_are_cached(self):
+        first = self.engine.layout(self.text, "Bork", self.body_font, self.author_font, 150)
+        self.assertIs(self.engine.layout(self.text, "Bork", self.body_font, self.author_font, 150), first)
+        self.assertEqual(self.engine.info()['hits'], 1)
+
+    def test_fit_finds_largest_fitting_size(self):
+        layout = self.engine.fit(self.text, "Bork", self.body_font, self.author_font, 300, 150, 8, 60)
+        self.assertLessEqual(layout.width, 300)
+        self.assertLessEqual(layout.height, 150)
+        size = layout.lines[0].font.size
+        larger = self.engine.layout(self.text, "Bork", Utils.font_cache.get(self.body_font.path, size + 1),
+                                    Utils.font_cache.get(self.author_font.path, size + 1), 300)
+        self.assertTrue(larger.width > 300 or larger.height > 150)
+
+    def test_bitmap_font_without_path_is_laid_out(self):
+        # Pillow's built-in bitmap font has no path or size attribute
+        bitmap = getattr(ImageFont, 'load_default_imagefont', ImageFont.load_default)()
+        layout = self.engine.layout(self.text, "Bork", bitmap, bitmap, 150)
+        self.assertEqual(layout.lines[-1].text, "Bork")
+        self.assertGreater(layout.height, 0)
+        self.assertIs(self.engine.fit(self.text, "Bork", bitmap, bitmap, 150, 100, 8, 20), layout)
+
+
+if __name__ == '__main__':
+    unittest.main()
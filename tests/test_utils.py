@@ -0,0 +1,95 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from PIL import Image
+
+from util.Utils import Utils
+
+
+class TestResourceResolution(unittest.TestCase):
+
+    def setUp(self):
+        self.root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    def tearDown(self):
+        Utils.set_project_root(None)
+
+    def test_explicit_root(self):
+        Utils.set_project_root(self.root)
+        self.assertEqual(Utils.retrieve_file_dir('fonts'),
+                         os.path.join(self.root, 'data_private/res/font/open-sans'))
+
+    def test_root_from_environment(self):
+        with mock.patch.dict(os.environ, {Utils.root_env_var: self.root}):
+            Utils.set_project_root(None)
+            self.assertEqual(Utils.project_root(), self.root)
+
+    def test_root_without_git_falls_back_to_package(self):
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as tmp_dir, mock.patch.dict(os.environ, clear=True):
+            os.chdir(tmp_dir)
+            try:
+                Utils.set_project_root(None)
+                self.assertEqual(Utils.project_root(), self.root)
+            finally:
+                os.chdir(cwd)
+
+    def test_paths_are_memoized(self):
+        Utils.set_project_root(self.root)
+        path = Utils.retrieve_file_path('fonts', 'OpenSans-Regular.ttf')
+        with mock.patch.object(Utils, 'retrieve_config', side_effect=AssertionError):
+            self.assertEqual(Utils.retrieve_file_path('fonts', 'OpenSans-Regular.ttf'), path)
+
+    def test_unknown_file_is_not_available(self):
+        self.assertIsNone(Utils.retrieve_file_path('fonts', 'missing.ttf'))
+
+
+class TestImageValidation(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.image = os.path.join(self.tmp_dir, 'image.jpg')
+        Image.new('RGB', (10, 10)).save(self.image)
+        self.broken = os.path.join(self.tmp_dir, 'broken.jpg')
+        with open(self.broken, 'wb') as file:
+            file.write(b'not an image')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_valid_image_is_verified_once(self):
+        self.assertTrue(Utils.is_valid_image(self.image))
+        with mock.patch('util.Utils.Image.open', side_effect=AssertionError):
+            self.assertTrue(Utils.is_valid_image(self.image))
+            self.assertEqual(Utils.resolve_image_path(self.image, 'default.jpg'), self.image)
+
+    def test_modified_image_is_verified_again(self):
+        self.assertTrue(Utils.is_valid_image(self.image))
+        with open(self.image, 'wb') as file:
+            file.write(b'no longer an image')
+        self.assertFalse(Utils.is_valid_image(self.image))
+
+    def test_recently_checked_images_survive_eviction(self):
+        with mock.patch.object(Utils, 'max_image_checks', 2):
+            self.assertTrue(Utils.is_valid_image(self.image))
+            self.assertFalse(Utils.is_valid_image(self.broken))
+            self.assertTrue(Utils.is_valid_image(self.image))
+            # A one-off file evicts the least recently checked path, not the whole cache
+            other = os.path.join(self.tmp_dir, 'upload.jpg')
+            shutil.copy(self.image, other)
+            self.assertTrue(Utils.is_valid_image(other))
+            self.assertIn(self.image, Utils._image_checks)
+            self.assertNotIn(self.broken, Utils._image_checks)
+            self.assertLessEqual(len(Utils._image_checks), 2)
+
+    def test_validate_images_skips_invalid_files(self):
+        hidden = os.path.join(self.tmp_dir, '.hidden.jpg')
+        shutil.copy(self.image, hidden)
+        self.assertEqual(Utils.validate_images([self.broken, self.image, hidden]), [self.image])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+"""
+This module provides a polling file watcher that runs in a background thread.
+It needs no external service: changes are detected by comparing (mtime, size)
+snapshots of the watched directories.
+
+Classes:
+    FileWatcher: Polls directories and reports added, changed and removed files.
+"""
+
+import os
+import threading
+from typing import Callable, Dict, Iterable, Set, Tuple
+
+Snapshot = Dict[str, Tuple[int, int]]
+
+
+class FileWatcher:
+    """
+    Poll directories and report added, changed and removed files.
+
+    Attributes:
+        directories (list): (directory, extensions) pairs to watch. Files are matched
+            case-insensitively on their extension, subdirectories are not watched.
+        callback (Callable): Called with the set of added, changed or removed paths.
+        interval (float): The number of seconds between two polls.
+    """
+
+    def __init__(self, directories: Iterable[Tuple[str, Tuple[str, ...]]],
+                 callback: Callable[[Set[str]], None], interval: float = 5.0):
+        self.directories = list(directories)
+        self.callback = callback
+        self.interval = interval
+        self._snapshot = self.snapshot()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def snapshot(self) -> Snapshot:
+        """
+        Take the (mtime, size) snapshot of the watched files.
+
+        Returns:
+            dict: The mtime in nanoseconds and the size of each watched file, by path.
+        """
+        snapshot = {}
+        for directory, extensions in self.directories:
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.name.lower().endswith(extensions) and entry.is_file():
+                            stat = entry.stat()
+                            snapshot[entry.path] = (stat.st_mtime_ns, stat.st_size)
+            except FileNotFoundError:
+                continue
+        return snapshot
+
+    def poll(self) -> Set[str]:
+        """
+        Compare the watched files with the previous snapshot.
+
+        Returns:
+            set: The paths of the files that were added, changed or removed since the last poll.
+        """
+        snapshot = self.snapshot()
+        changed = {path for path, stat in snapshot.items() if self._snapshot.get(path) != stat}
+        changed.update(path for path in self._snapshot if path not in snapshot)
+        self._snapshot = snapshot
+        return changed
+
+    def check(self):
+        """Poll once and invoke the callback if any file changed."""
+        changed = self.poll()
+        if changed:
+            self.callback(changed)
+
+    def start(self):
+        """Start polling in a daemon thread."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='FileWatcher', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop polling and wait for the thread to finish."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        """Poll until stopped, reporting callback errors without stopping the thread."""
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception as e:
+                print(f"Error while reloading watched files: {e}")
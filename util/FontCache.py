@@ -0,0 +1,95 @@
+"""
+This module provides a process-wide cache of loaded TrueType fonts.
+
+Loading a font parses the whole font file, so fonts are loaded once per
+(font path, size) and shared by all later memes.
+
+Classes:
+    FontCache: A thread-safe LRU cache of FreeType fonts keyed by path and size.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Dict, Tuple
+
+from PIL import ImageFont
+
+
+class FontCache:
+    """
+    A thread-safe LRU cache of FreeType fonts keyed by (font path, size).
+
+    Attributes:
+        maxsize (int): The maximum number of fonts kept. The least recently used font is evicted first.
+        hits (int): The number of lookups answered from the cache.
+        misses (int): The number of lookups that loaded a font file.
+    """
+
+    default_size = 10
+
+    def __init__(self, maxsize: int = 64):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._fonts: "OrderedDict[Tuple[str, int], ImageFont.FreeTypeFont]" = OrderedDict()
+        self._default_font = None
+        self._lock = threading.Lock()
+
+    def get(self, font_path: str, size: int = default_size) -> ImageFont.FreeTypeFont:
+        """
+        Return the font of a font file at a size, loading it on first use.
+
+        Args:
+            font_path (str): The path to the TrueType font file.
+            size (int): The font size in points. Defaults to Pillow's default size of 10.
+
+        Returns:
+            ImageFont.FreeTypeFont: The shared font object.
+
+        Raises:
+            OSError: If the font file cannot be read.
+        """
+        key = (font_path, size)
+        with self._lock:
+            font = self._fonts.get(key)
+            if font is not None:
+                self._fonts.move_to_end(key)
+                self.hits += 1
+                return font
+            self.misses += 1
+
+        # Load outside of the lock, so a slow font file does not block other lookups
+        font = ImageFont.truetype(font_path, size)
+        with self._lock:
+            self._fonts[key] = font
+            self._fonts.move_to_end(key)
+            while len(self._fonts) > self.maxsize:
+                self._fonts.popitem(last=False)
+        return font
+
+    def load_default(self) -> ImageFont.ImageFont:
+        """Return Pillow's built-in default font, loading it once."""
+        if self._default_font is None:
+            self._default_font = ImageFont.load_default()
+        return self._default_font
+
+    def clear(self):
+        """Remove all fonts and reset the counters."""
+        with self._lock:
+            self._fonts.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self) -> Dict[str, int]:
+        """
+        Report the cache statistics.
+
+        Returns:
+            dict: The hits, misses, current size and maximum size of the cache.
+        """
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses,
+                    'size': len(self._fonts), 'maxsize': self.maxsize}
+
+    def __len__(self) -> int:
+        return len(self._fonts)
@@ -0,0 +1,163 @@
+"""
+This module provides a process-wide cache of decoded and resized images.
+
+Memes are drawn on one of a handful of library images, so each image is decoded
+and resized once per width and later renders copy the cached result.
+
+Classes:
+    ImageCache: A thread-safe LRU cache of resized images with a memory budget.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Tuple
+
+from PIL import Image
+
+
+class ImageCache:
+    """
+    A thread-safe LRU cache of resized images keyed by (path, mtime, width).
+
+    The key includes the modification time of the file, so a replaced image is
+    decoded again. Cached images are shared and must not be modified; callers
+    draw on a copy.
+
+    Attributes:
+        max_bytes (int): The memory budget of the cached pixel data. The least
+            recently used images are evicted first; an image larger than the
+            budget is not cached.
+        hits (int): The number of lookups answered from the cache.
+        misses (int): The number of lookups that decoded an image.
+        evictions (int): The number of images evicted to stay within the budget.
+        draft_ratio (float): How many times wider than the target a JPEG must be to be
+            decoded at a reduced scale.
+        max_sizes (int): The maximum number of source image sizes kept by source_size.
+    """
+
+    draft_ratio = 2
+    max_sizes = 4096
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._images: "OrderedDict[Tuple[str, int, int], Image.Image]" = OrderedDict()
+        self._sizes: Dict[Tuple[str, int], Tuple[int, int]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, path: str, width: int) -> Image.Image:
+        """
+        Return an image resized to a width, keeping its aspect ratio.
+
+        Args:
+            path (str): The path to the image file.
+            width (int): The width of the resized image.
+
+        Returns:
+            Image.Image: The shared resized image. Copy it before drawing on it.
+
+        Raises:
+            OSError: If the file cannot be read or is not an image.
+        """
+        key = (path, os.stat(path).st_mtime_ns, width)
+        with self._lock:
+            image = self._images.get(key)
+            if image is not None:
+                self._images.move_to_end(key)
+                self.hits += 1
+                return image
+            self.misses += 1
+
+        # Decode outside of the lock, so other renders are not blocked
+        image = self.load(path, width)
+        size = self.image_bytes(image)
+        if size <= self.max_bytes:
+            with self._lock:
+                if key not in self._images:
+                    self._images[key] = image
+                    self.nbytes += size
+                    while self.nbytes > self.max_bytes:
+                        _, evicted = self._images.popitem(last=False)
+                        self.nbytes -= self.image_bytes(evicted)
+                        self.evictions += 1
+        return image
+
+    def source_size(self, path: str) -> Tuple[int, int]:
+        """
+        Return the size of an image file, reading its header once per modification time.
+
+        Args:
+            path (str): The path to the image file.
+
+        Returns:
+            tuple: The width and height of the image.
+
+        Raises:
+            OSError: If the file cannot be read or is not an image.
+        """
+        key = (path, os.stat(path).st_mtime_ns)
+        size = self._sizes.get(key)
+        if size is None:
+            with Image.open(path) as img:
+                size = img.size
+            with self._lock:
+                if len(self._sizes) >= self.max_sizes:
+                    self._sizes.clear()
+                self._sizes[key] = size
+        return size
+
+    @classmethod
+    def load(cls, path: str, width: int) -> Image.Image:
+        """
+        Decode an image and resize it to a width, keeping its aspect ratio.
+
+        A JPEG at least draft_ratio times wider than the target is decoded at a
+        reduced scale (1/2, 1/4 or 1/8) that is still at least as large as the
+        target, which skips most of the decoding work before the final resize.
+
+        Args:
+            path (str): The path to the image file.
+            width (int): The width of the resized image.
+
+        Returns:
+            Image.Image: The resized image.
+        """
+        with Image.open(path) as img:
+            ratio = width / float(img.size[0])
+            height = int(ratio * img.size[1])
+            if img.format == 'JPEG' and img.size[0] >= width * cls.draft_ratio:
+                img.draft(img.mode, (width, height))
+            return img.resize((width, height), Image.LANCZOS)
+
+    @staticmethod
+    def image_bytes(image: Image.Image) -> int:
+        """Estimate the memory used by the pixel data of an image."""
+        return image.size[0] * image.size[1] * len(image.getbands())
+
+    def clear(self):
+        """Remove all images and reset the counters."""
+        with self._lock:
+            self._images.clear()
+            self._sizes.clear()
+            self.nbytes = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def info(self) -> Dict[str, int]:
+        """
+        Report the cache statistics.
+
+        Returns:
+            dict: The hits, misses, evictions, number of images and bytes used of the cache.
+        """
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                    'size': len(self._images), 'nbytes': self.nbytes, 'max_bytes': self.max_bytes}
+
+    def __len__(self) -> int:
+        return len(self._images)
@@ -0,0 +1,280 @@
+"""
+This module manages the disk space used by generated memes.
+
+Memes are spread over sharded subdirectories so no directory grows large, and a
+sweeper removes expired memes and evicts the least recently used ones whenever
+the store exceeds its byte or file quota. The sweeper runs in a background
+thread and works from an in-memory index, which is rebuilt from disk every few
+sweeps and whenever the quota is exceeded, so the files written by other
+processes sharing the directory are counted as well.
+
+Classes:
+    OutputStore: Sharded meme storage with quotas, eviction and a background sweeper.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+
+class OutputStore:
+    """
+    Sharded storage for generated memes with quotas, eviction and a background sweeper.
+
+    Only files whose name starts with prefix are managed, so other files in the
+    directory are never removed. Memes saved before sharding was introduced, directly
+    in the directory, are managed as well.
+
+    Attributes:
+        root (str): The directory the memes are stored in.
+        max_bytes (int): The maximum total size of the memes, or None for no limit.
+        max_files (int): The maximum number of memes, or None for no limit.
+        max_age (float): The number of seconds after its last use a meme is removed, or None.
+        interval (float): The number of seconds between two background sweeps.
+        shard_width (int): The number of hexadecimal characters of the shard directory names.
+        rescan_every (int): The number of sweeps after which the index is rebuilt from disk.
+    """
+
+    prefix = 'meme_'
+
+    def __init__(self, root: str, max_bytes: Optional[int] = None, max_files: Optional[int] = None,
+                 max_age: Optional[float] = None, interval: float = 60.0, shard_width: int = 2,
+                 rescan_every: int = 10):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.max_files = max_files
+        self.max_age = max_age
+        self.interval = interval
+        self.shard_width = shard_width
+        self.rescan_every = rescan_every
+        self.nbytes = 0
+        self.sweeps = 0
+        self.expired = 0
+        self.evicted = 0
+        self.evicted_bytes = 0
+        self.last_sweep_seconds = 0.0
+        # Managed files by path, least recently used first, with their size and last use
+        self._files: "Optional[OrderedDict[str, Tuple[int, float]]]" = None
+        self._shards = set()
+        # Whether the index must be rebuilt from disk before the next sweep
+        self._stale = True
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread = None
+
+    @classmethod
+    def from_config(cls, root: str, settings: Dict) -> 'OutputStore':
+        """
+        Create a store from the 'output_store' section of the configuration.
+
+        Args:
+            root (str): The directory the memes are stored in.
+            settings (dict): The max_bytes, max_files, max_age, interval, shard_width and
+                rescan_every settings.
+
+        Returns:
+            OutputStore: The configured store.
+        """
+        keys = ('max_bytes', 'max_files', 'max_age', 'interval', 'shard_width', 'rescan_every')
+        return cls(root, **{key: settings[key] for key in keys if key in settings})
+
+    def settings(self) -> Dict:
+        """
+        Get the settings of the store, e.g. to create the same store in another process.
+
+        Returns:
+            dict: The max_bytes, max_files, max_age, interval, shard_width and rescan_every
+                settings, as accepted by from_config.
+        """
+        return {'max_bytes': self.max_bytes, 'max_files': self.max_files, 'max_age': self.max_age,
+                'interval': self.interval, 'shard_width': self.shard_width, 'rescan_every': self.rescan_every}
+
+    def path_for(self, name: str) -> str:
+        """
+        Return the path a file is stored at, creating its shard directory if needed.
+
+        Args:
+            name (str): The file name.
+
+        Returns:
+            str: The path of the file in its shard directory.
+        """
+        shard = hashlib.blake2b(name.encode('utf-8'), digest_size=4).hexdigest()[:self.shard_width]
+        directory = os.path.join(self.root, shard)
+        if shard not in self._shards:
+            os.makedirs(directory, exist_ok=True)
+            self._shards.add(shard)
+        return os.path.join(directory, name)
+
+    def add(self, path: str, size: Optional[int] = None):
+        """
+        Register a file that was written to the store.
+
+        If the store is over its quota, the background sweeper is woken up early and
+        rebuilds the index from disk first, since other processes may have removed files.
+
+        Args:
+            path (str): The path of the file.
+            size (int, optional): The size of the file. Defaults to its size on disk.
+        """
+        if size is None:
+            size = os.path.getsize(path)
+        with self._lock:
+            if self._files is None:
+                return
+            previous = self._files.pop(path, None)
+            if previous is not None:
+                self.nbytes -= previous[0]
+            self._files[path] = (size, time.time())
+            self.nbytes += size
+            over_quota = self._over_quota()
+            if over_quota:
+                self._stale = True
+        if over_quota:
+            self._wake.set()
+
+    def touch(self, path: str):
+        """
+        Mark a file as used, so it is evicted later.
+
+        The modification time of the file is updated as well, so the use is kept when the
+        index is rebuilt from disk, e.g. after a restart or by another process.
+
+        Args:
+            path (str): The path of the file.
+        """
+        now = time.time()
+        try:
+            os.utime(path, (now, now))
+        except FileNotFoundError:
+            pass
+        with self._lock:
+            if self._files is not None and path in self._files:
+                size, _ = self._files.pop(path)
+                self._files[path] = (size, now)
+
+    def scan(self):
+        """Rebuild the index from the files on disk, ordered by modification time."""
+        files = []
+        for directory in self._directories():
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.name.startswith(self.prefix) and entry.is_file():
+                            stat = entry.stat()
+                            files.append((stat.st_mtime, entry.path, stat.st_size))
+            except FileNotFoundError:
+                continue
+        files.sort()
+        with self._lock:
+            self._files = OrderedDict((path, (size, mtime)) for mtime, path, size in files)
+            self.nbytes = sum(size for _, _, size in files)
+            self._stale = False
+
+    def sweep(self):
+        """
+        Remove expired files, then evict the least recently used files until the store is within its quota.
+
+        The index is rebuilt from disk on the first sweep, every rescan_every sweeps and
+        after the quota was exceeded.
+        """
+        started = time.perf_counter()
+        if self._stale or self._files is None or (self.rescan_every and self.sweeps % self.rescan_every == 0):
+            self.scan()
+
+        removed = []
+        pending_bytes = 0
+        with self._lock:
+            if self.max_age is not None:
+                cutoff = time.time() - self.max_age
+                expired = [path for path, (_, used) in self._files.items() if used < cutoff]
+                for path in expired:
+                    size = self._files.pop(path)[0]
+                    removed.append((path, size, True))
+                    pending_bytes += size
+            while self._files and self._over_quota(pending_bytes):
+                path, (size, _) = self._files.popitem(last=False)
+                removed.append((path, size, False))
+                pending_bytes += size
+
+        for path, size, is_expired in removed:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            with self._lock:
+                self.nbytes -= size
+                if is_expired:
+                    self.expired += 1
+                else:
+                    self.evicted += 1
+                self.evicted_bytes += size
+
+        self.sweeps += 1
+        self.last_sweep_seconds = time.perf_counter() - started
+
+    def start(self):
+        """Start sweeping in a daemon thread."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='OutputStore', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop sweeping and wait for the thread to finish."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def info(self) -> Dict[str, float]:
+        """
+        Report the store metrics.
+
+        Returns:
+            dict: The number of files and bytes stored, the quotas, and the number of
+                sweeps, expired and evicted files and bytes freed so far.
+        """
+        with self._lock:
+            return {'files': len(self._files) if self._files is not None else None,
+                    'bytes': self.nbytes, 'max_files': self.max_files, 'max_bytes': self.max_bytes,
+                    'sweeps': self.sweeps, 'expired': self.expired, 'evicted': self.evicted,
+                    'freed_bytes': self.evicted_bytes, 'last_sweep_seconds': self.last_sweep_seconds}
+
+    def _over_quota(self, pending_bytes: int = 0) -> bool:
+        """Check whether the indexed files exceed the byte or file quota, not counting pending_bytes."""
+        if self.max_files is not None and len(self._files) > self.max_files:
+            return True
+        return self.max_bytes is not None and self.nbytes - pending_bytes > self.max_bytes
+
+    def _directories(self):
+        """List the root and its shard directories."""
+        yield self.root
+        try:
+            with os.scandir(self.root) as entries:
+                shards = [entry.path for entry in entries
+                          if len(entry.name) == self.shard_width and self._is_hex(entry.name) and entry.is_dir()]
+        except FileNotFoundError:
+            return
+        yield from shards
+
+    @staticmethod
+    def _is_hex(name: str) -> bool:
+        """Check whether a directory name is a shard name."""
+        return all(char in '0123456789abcdef' for char in name)
+
+    def _run(self):
+        """Sweep until stopped, reporting errors without stopping the thread."""
+        while not self._stop.is_set():
+            try:
+                self.sweep()
+            except Exception as e:
+                print(f"Error while sweeping generated memes: {e}")
+            self._wake.wait(self.interval)
+            self._wake.clear()
@@ -0,0 +1,98 @@
+"""
+This module provides a process-wide cache of encoded meme images.
+
+Seeded memes are deterministic, so a meme rendered once for a key can be served
+again from memory instead of being drawn and encoded again.
+
+Classes:
+    RenderCache: A thread-safe LRU cache of encoded images with a memory budget.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+
+class RenderCache:
+    """
+    A thread-safe LRU cache of encoded images keyed by their render key.
+
+    Attributes:
+        max_bytes (int): The memory budget of the cached images. The least recently
+            used images are evicted first; an image larger than the budget is not cached.
+        hits (int): The number of lookups answered from the cache.
+        misses (int): The number of lookups that found no image.
+        evictions (int): The number of images evicted to stay within the budget.
+    """
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._images: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Return the cached image of a key.
+
+        Args:
+            key (str): The render key.
+
+        Returns:
+            bytes: The encoded image, or None if it is not cached.
+        """
+        with self._lock:
+            data = self._images.get(key)
+            if data is None:
+                self.misses += 1
+                return None
+            self._images.move_to_end(key)
+            self.hits += 1
+            return data
+
+    def put(self, key: str, data: bytes):
+        """
+        Cache the encoded image of a key, evicting the least recently used images over the budget.
+
+        Args:
+            key (str): The render key.
+            data (bytes): The encoded image.
+        """
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._images.pop(key, None)
+            if previous is not None:
+                self.nbytes -= len(previous)
+            self._images[key] = data
+            self.nbytes += len(data)
+            while self.nbytes > self.max_bytes:
+                _, evicted = self._images.popitem(last=False)
+                self.nbytes -= len(evicted)
+                self.evictions += 1
+
+    def clear(self):
+        """Remove all images and reset the counters."""
+        with self._lock:
+            self._images.clear()
+            self.nbytes = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def info(self) -> Dict[str, int]:
+        """
+        Report the cache statistics.
+
+        Returns:
+            dict: The hits, misses, evictions, number of images and bytes used of the cache.
+        """
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                    'size': len(self._images), 'nbytes': self.nbytes, 'max_bytes': self.max_bytes}
+
+    def __len__(self) -> int:
+        return len(self._images)
@@ -1,13 +1,27 @@
 import inspect
 import os
 import re
+import shutil
+import threading
+from collections import OrderedDict
 from typing import List, Tuple
 from PIL import Image, ImageFont
 from config import load_config
+from util.FontCache import FontCache
 
 
 class Utils:
 
+    root_env_var = 'MEME_GENERATOR_ROOT'
+    _project_root = None
+    _root_lock = threading.Lock()
+    _resources = {}
+    font_cache = FontCache()
+    # Image validation results, least recently used first
+    _image_checks = OrderedDict()
+    _image_checks_lock = threading.Lock()
+    max_image_checks = 4096
+
     @staticmethod
     def validate_image_path(path: str, default_path: str) -> str:
         """
@@ -47,18 +61,74 @@ class Utils:
             return default_path
         
         # Check if the file is a valid image
+        return file_path if Utils.is_valid_image(file_path) else default_path
+
+    @staticmethod
+    def is_valid_image(file_path: str) -> bool:
+        """
+        Check if a file is a valid image, verifying it only if it is new or was modified.
+
+        The result is cached by (path, mtime, size), so an image is read and verified
+        once and later checks cost a single stat. The least recently checked paths are
+        evicted first, so one-off files such as uploads do not push out the library images.
+
+        Args:
+            file_path (str): The path to the file.
+
+        Returns:
+            bool: True if the file can be opened and verified as an image.
+        """
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return False
+        signature = (stat.st_mtime_ns, stat.st_size)
+        with Utils._image_checks_lock:
+            cached = Utils._image_checks.get(file_path)
+            if cached is not None and cached[0] == signature:
+                Utils._image_checks.move_to_end(file_path)
+                return cached[1]
+
         try:
             with Image.open(file_path) as img:
                 img.verify()
-            return file_path
-        except (IOError, SyntaxError) as e:
-            return default_path
+            valid = True
+        except (IOError, SyntaxError):
+            valid = False
+        with Utils._image_checks_lock:
+            Utils._image_checks[file_path] = (signature, valid)
+            Utils._image_checks.move_to_end(file_path)
+            while len(Utils._image_checks) > Utils.max_image_checks:
+                Utils._image_checks.popitem(last=False)
+        return valid
+
+    @staticmethod
+    def validate_images(file_paths: List[str]) -> List[str]:
+        """
+        Validate a collection of images at once, e.g. the image library at startup.
+
+        Invalid and hidden files are reported and left out. The results are cached,
+        so rendering a meme on one of the valid images does not verify it again.
+
+        Args:
+            file_paths (List[str]): The paths to the image files.
+
+        Returns:
+            List[str]: The paths of the valid images, in the given order.
+        """
+        valid_paths = []
+        for file_path in file_paths:
+            if not os.path.basename(file_path).startswith('.') and Utils.is_valid_image(file_path):
+                valid_paths.append(file_path)
+            else:
+                print(f"Skipping invalid image {file_path}.")
+        return valid_paths
    
     @staticmethod
     def load_font(font_path: str) -> ImageFont.ImageFont:
         """
         Checks if the font file at the given path exists. If the path is invalid or the font file does not exist,
-        returns a default font object.
+        returns a default font object. Fonts are shared through Utils.font_cache.
 
         :param font_path: The path to the font file to check.
         :return: An ImageFont object.
@@ -68,9 +138,9 @@ class Utils:
                 print("No valid font path provided, using default font.")
             else:
                 print(f"Font not found at {font_path}, using default font.")
-            return ImageFont.load_default()
+            return Utils.font_cache.load_default()
         else:
-            return ImageFont.truetype(font_path)
+            return Utils.font_cache.get(font_path)
 
     @staticmethod
     def calculate_font_size(font: ImageFont.ImageFont, text: str, height: int) -> ImageFont.FreeTypeFont:
@@ -80,7 +150,8 @@ class Utils:
         The font size is determined by the length of the text.
         The length is mapped to a font size using linear interpolation
         to ensure smooth transitions within the range of 0 to 256.
-        If the default font is used, no adjustment is made.
+        If the default font is used, no adjustment is made. The resized
+        font is taken from Utils.font_cache.
 
         Args:
             font (ImageFont.ImageFont): The font object.
@@ -92,8 +163,8 @@ class Utils:
             None: If an error occurs.
         """
         try:
-            # Check if the font is the default font
-            if font == ImageFont.load_default():
+            # Only fonts loaded from a font file can be resized
+            if not isinstance(font, ImageFont.FreeTypeFont) or not isinstance(font.path, str):
                 print("ImageFont not found, using default font.")
                 return font
 
@@ -107,9 +178,7 @@ class Utils:
             else:
                 font_size = height * (0.03 - (0.01 * ((text_length - 256) / 256)))
 
-           
-            font_path = font.path  # Assuming the font object has a 'path' attribute
-            return ImageFont.truetype(font_path, int(font_size))
+            return Utils.font_cache.get(font.path, int(font_size))
         except Exception as e:
             print(f"Error occurred: {str(e)}")
             return None
@@ -256,6 +325,68 @@ class Utils:
             current_directory = new_directory
 
 
+    @staticmethod
+    def set_project_root(root_path: str):
+        """
+        Set the project root explicitly, e.g. for deployments without a .git directory.
+
+        The resource paths resolved so far are forgotten, so they are resolved again
+        against the new root. Passing None restores the automatic lookup.
+
+        Parameters:
+        root_path (str): The project root directory, or None.
+        """
+        with Utils._root_lock:
+            Utils._project_root = os.path.abspath(root_path) if root_path else None
+            Utils._resources.clear()
+
+    @staticmethod
+    def project_root() -> str:
+        """
+        Return the project root directory, resolving it on first use.
+
+        The root is taken from, in order: set_project_root, the MEME_GENERATOR_ROOT
+        environment variable, the nearest directory above the working directory that
+        contains .git, and finally the directory this package is installed in.
+
+        Returns:
+        str: The path to the project root directory.
+        """
+        root = Utils._project_root
+        if root is None:
+            with Utils._root_lock:
+                if Utils._project_root is None:
+                    Utils._project_root = Utils._find_project_root()
+                root = Utils._project_root
+        return root
+
+    @staticmethod
+    def _find_project_root() -> str:
+        """Look up the project root from the environment, the working directory or the package location."""
+        root = os.environ.get(Utils.root_env_var)
+        if root:
+            return os.path.abspath(root)
+        try:
+            return Utils.locate_project_root(os.getcwd())
+        except FileNotFoundError:
+            return os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    @staticmethod
+    def preload_resources():
+        """
+        Resolve the paths of all configured directories and files at once.
+
+        Later calls of retrieve_file_dir and retrieve_file_path for these resources
+        are then answered from memory.
+        """
+        config = Utils.retrieve_config()
+        for category in config.paths:
+            Utils.retrieve_file_dir(category)
+        for category, file_names in config.files.items():
+            if category in config.paths:
+                for file_name in file_names:
+                    Utils.retrieve_file_path(category, file_name)
+
     @staticmethod
     def retrieve_file_path(category: str, file_name: str) -> str:
         """
@@ -263,7 +394,8 @@ class Utils:
 
         This function constructs the path to the default cache file based on the
         category and file name provided. It combines the project's root path
-        with the specific path defined in the configuration file.
+        with the specific path defined in the configuration file. The result is
+        memoized, so repeated lookups do not touch the file system.
 
         Parameters:
         category (str): The category for which the cache path is needed.
@@ -276,14 +408,16 @@ class Utils:
         Raises:
         ValueError: If the configuration path is invalid.
         """
-        try:
-            root_path = Utils.locate_project_root(os.getcwd())
-            config = Utils.load_development_config(root_path)
-            cache_path = config.get_file_path(category, file_name)
-            return os.path.join(root_path, cache_path)
-        except ValueError:
-            print("Not available")
-            return None
+        key = ('file', category, file_name)
+        path = Utils._resources.get(key)
+        if path is None:
+            try:
+                cache_path = Utils.retrieve_config().get_file_path(category, file_name)
+            except ValueError:
+                print("Not available")
+                return None
+            path = Utils._resources[key] = os.path.join(Utils.project_root(), cache_path)
+        return path
         
     @staticmethod
     def retrieve_file_paths(directory_path: str, valid_extensions: Tuple[str, ...]) -> List[str]:
@@ -314,7 +448,8 @@ class Utils:
 
         This function constructs the path to the default cache directory based on the
         category provided. It combines the project's root path with the specific 
-        path defined in the configuration file.
+        path defined in the configuration file. The result is memoized, so repeated
+        lookups do not touch the file system.
 
         Parameters:
         category (str): The category for which the cache directory path is needed.
@@ -326,14 +461,50 @@ class Utils:
         Raises:
         ValueError: If the configuration path is invalid.
         """
-        try:
-            root_path = Utils.locate_project_root(os.getcwd())
-            config = Utils.load_development_config(root_path)
-            cache_path = config.get_directory(category)
-            return os.path.join(root_path, cache_path)
-        except ValueError:
-            print("Not available")
-            return None
+        key = ('dir', category)
+        path = Utils._resources.get(key)
+        if path is None:
+            try:
+                cache_path = Utils.retrieve_config().get_directory(category)
+            except ValueError:
+                print("Not available")
+                return None
+            path = Utils._resources[key] = os.path.join(Utils.project_root(), cache_path)
+        return path
+
+    @staticmethod
+    def retrieve_config():
+        """
+        Retrieve the configuration of the project.
+
+        Returns:
+        Config: The configuration loaded from the project's development config file.
+        """
+        return Utils.load_development_config(Utils.project_root())
+
+    @staticmethod
+    def retrieve_tool_path(name: str) -> str:
+        """
+        Resolve the executable of an external tool.
+
+        The tool is looked up under the 'tools' section of the configuration file,
+        which may hold a bare command name or a full path, and then on the PATH.
+        The result is memoized, including a tool that was not found.
+
+        Parameters:
+        name (str): The name of the tool (e.g. 'pdftotext').
+
+        Returns:
+        str: The full path to the executable, or None if it cannot be found.
+        """
+        key = ('tool', name)
+        if key not in Utils._resources:
+            try:
+                configured = Utils.retrieve_config().get_tool(name)
+            except (ValueError, FileNotFoundError):
+                configured = None
+            Utils._resources[key] = shutil.which(configured or name)
+        return Utils._resources[key]
 
     @staticmethod
     def load_development_config(root_path: str, config_path='config/development.json'):
@@ -355,17 +526,20 @@ class Utils:
         """
         Get the path to a child directory within the calling script's directory.
 
+        Output locations are configured under 'paths' and resolved with retrieve_file_dir;
+        this helper is kept for scripts that locate files next to themselves.
+
         Parameters:
         child_dir_name (str): The name of the child directory.
 
         Returns:
         str: The absolute path to the child directory.
         """
-        # Get the frame of the caller
-        caller_frame = inspect.stack()[1]
+        # Get the frame of the caller, without building the frame info of the whole stack
+        caller_frame = inspect.currentframe().f_back
         
         # Get the absolute path of the calling script
-        calling_script_path = os.path.abspath(caller_frame.filename)
+        calling_script_path = os.path.abspath(caller_frame.f_code.co_filename)
         
         # Get the directory name of the calling script's absolute path
         calling_script_directory = os.path.dirname(calling_script_path)
@@ -386,11 +560,11 @@ class Utils:
         Returns:
         str: The absolute path to the calling script's directory.
         """
-        # Get the frame of the caller
-        caller_frame = inspect.stack()[1]
+        # Get the frame of the caller, without building the frame info of the whole stack
+        caller_frame = inspect.currentframe().f_back
         
         # Get the absolute path of the calling script
-        calling_script_path = os.path.abspath(caller_frame.filename)
+        calling_script_path = os.path.abspath(caller_frame.f_code.co_filename)
         
         # Get the directory name of the calling script's absolute path
         calling_script_directory = os.path.dirname(calling_script_path)